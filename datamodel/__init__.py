@@ -2,3 +2,6 @@ from pathlib import Path
 
 datamodel_path = Path(__file__).parent
 input_path = (datamodel_path / ".." / "input").resolve()
+
+# Version of the format documentation (folder under input/) the models were generated from
+format_version = "20221109"
@@ -0,0 +1,194 @@
+"""Crash-safe writes of files.
+
+atomic_write writes to a temporary file in the directory of the target,
+flushes it to disk and renames it into place, so that readers see either the
+previous file or the complete new one, never a truncated file. With checksum,
+the SHA-256 of the bytes written is stored next to the file in
+<filename>.sha256, in the format of sha256sum, so that readers can check a
+file without parsing it:
+
+    problem_data.save("case.json.gz", checksum=True)
+    verify_checksum("case.json.gz")   # or: sha256sum -c case.json.gz.sha256
+"""
+
+import contextlib
+import hashlib
+import io
+import logging
+import os
+import secrets
+from pathlib import Path
+
+from datamodel.compression import CODECS, compression_from_extension
+
+logger = logging.getLogger(__name__)
+
+CHECKSUM_SUFFIX = ".sha256"
+
+# Size of the blocks read to compute a checksum
+BLOCK_SIZE = 1 << 20
+
+
+class ChecksumError(ValueError):
+    """The content of a file does not match its checksum sidecar."""
+
+
+class _HashingWriter(io.RawIOBase):
+    """Binary file that passes the bytes written on to a file and hashes them."""
+
+    def __init__(self, file):
+        self.file = file
+        self.hash = hashlib.sha256()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.file.write(data)
+        self.hash.update(data)
+        return len(data)
+
+
+def checksum_path(filename):
+    """Return the path of the checksum sidecar of filename."""
+    filename = Path(filename)
+    return filename.with_name(filename.name + CHECKSUM_SUFFIX)
+
+
+def file_checksum(filename):
+    """Return the SHA-256 of the bytes of a file, in hex."""
+    h = hashlib.sha256()
+    with open(filename, "rb") as f:
+        for block in iter(lambda: f.read(BLOCK_SIZE), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def read_checksum(filename):
+    """Return the SHA-256 recorded in the sidecar of filename, or None if
+    there is no sidecar."""
+    try:
+        text = checksum_path(filename).read_text(encoding="ascii")
+    except FileNotFoundError:
+        return None
+    return text.split(maxsplit=1)[0].lower() if text.strip() else ""
+
+
+def verify_checksum(filename):
+    """Check a file against its checksum sidecar.
+    Raises
+    ------
+    FileNotFoundError
+        If filename or its sidecar does not exist
+    ChecksumError
+        If the content does not match
+    """
+    expected = read_checksum(filename)
+    if expected is None:
+        raise FileNotFoundError(f"No checksum file {checksum_path(filename)}")
+    actual = file_checksum(filename)
+    if actual != expected:
+        raise ChecksumError(f"{filename} fails checksum. sha256: {actual}, expected: {expected}")
+
+
+def _create_temp(filename):
+    """Create an empty temporary file next to filename, with the permissions
+    open gives new files (0o666 less the umask, applied by the kernel).
+    Returns (file descriptor, path)."""
+    while True:
+        tmp = filename.with_name(f".{filename.name}.{secrets.token_hex(6)}.tmp")
+        try:
+            return os.open(tmp, os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, "O_BINARY", 0), 0o666), tmp
+        except FileExistsError:
+            continue
+
+
+def _replace(tmp, filename):
+    os.replace(tmp, filename)
+    try:
+        # make the rename itself durable
+        fd = os.open(Path(filename).parent, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _write_checksum(filename, digest):
+    sidecar = checksum_path(filename)
+    with atomic_write(sidecar, "wt", compression=None) as f:
+        f.write(f"{digest}  {Path(filename).name}\n")
+
+
+@contextlib.contextmanager
+def atomic_write(filename, mode="wt", compression="infer", encoding=None, checksum=False):
+    """Open a possibly compressed file for writing, replacing filename only
+    once everything was written. If the block raises, filename is left as it
+    was and the temporary file is removed.
+    Parameters
+    ----------
+    filename : str
+    mode : str
+        "wt" or "wb"
+    compression : str
+        "infer" to use the codec implied by the extension, None for an
+        uncompressed file, or one of the CODECS names
+    encoding : str
+        Text encoding for "wt". Defaults to utf-8.
+    checksum : bool
+        If True, also write the SHA-256 of the file to its sidecar (see
+        checksum_path). Otherwise an existing sidecar is removed, as it
+        would no longer match.
+    Yields
+    ------
+    file object
+        Once the block has run, its sha256 attribute holds the SHA-256 of
+        the bytes written, in hex
+    """
+    if mode not in ("w", "wt", "wb"):
+        raise ValueError(f"Unsupported mode {mode!r} for atomic_write. Supported: ['wt', 'wb']")
+    filename = Path(filename)
+    if compression == "infer":
+        compression = compression_from_extension(filename)
+    if compression is not None and compression not in CODECS:
+        raise ValueError(f"Unsupported compression {compression!r}. Supported: {list(CODECS)}")
+    if "b" not in mode and encoding is None:
+        encoding = "utf-8"
+
+    fd, tmp = _create_temp(filename)
+    try:
+        with os.fdopen(fd, "wb") as raw:
+            writer = _HashingWriter(raw)
+            buffer = io.BufferedWriter(writer)
+            if compression is not None:
+                stream = CODECS[compression][2](buffer, "wb" if "b" in mode else "wt", encoding=encoding)
+            elif "b" in mode:
+                stream = buffer
+            else:
+                stream = io.TextIOWrapper(buffer, encoding=encoding)
+            yield stream
+            stream.close()
+            buffer.close()
+            raw.flush()
+            os.fsync(raw.fileno())
+        try:
+            os.chmod(tmp, filename.stat().st_mode & 0o7777)
+        except FileNotFoundError:
+            pass
+        _replace(tmp, filename)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp)
+        raise
+    digest = writer.hash.hexdigest()
+    stream.sha256 = digest
+    if checksum:
+        _write_checksum(filename, digest)
+    else:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(checksum_path(filename))
+    logger.debug("Wrote %s (sha256 %s)", filename, digest)
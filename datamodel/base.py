@@ -1,15 +1,305 @@
-import logging
-from datetime import datetime, timedelta
+import concurrent.futures
+import contextlib
+import contextvars
+import functools
+import io
 import json
-import os
+import logging
+import mmap
+import threading
 from pathlib import Path
 
-from pydantic import BaseModel, Field, ValidationError
-from pydantic.json import isoformat, timedelta_isoformat
-from typing import Dict, List, Optional, Union, Tuple
+from pydantic import BaseModel, Field, PrivateAttr, ValidationError
+from pydantic.error_wrappers import ErrorWrapper
+from pydantic.fields import SHAPE_LIST, SHAPE_SINGLETON
+from pydantic.utils import ROOT_KEY
+from typing import Any, Dict, List, NamedTuple, Optional, Union, Tuple
+
+from datamodel import jsonbackends
+from datamodel.atomic import atomic_write
+from datamodel.compression import compression_from_magic, decompress, detect_compression, open_file, open_stream
+from datamodel.validation import expand_batch_errors
+from datamodel.writer import write_model
 
 logger = logging.getLogger(__name__)
 
+# Directory of the file currently being loaded in this thread/context. Used
+# instead of changing the process working directory so that loads can run
+# concurrently.
+_load_dir = contextvars.ContextVar("load_dir", default=None)
+
+
+def resolve_path(path):
+    """Resolve a path found within a data file relative to that file's directory.
+    Intended for use by validators; outside of a load, paths are resolved
+    against the current working directory.
+    Parameters
+    ----------
+    path : str
+    Returns
+    -------
+    Path
+    """
+    path = Path(path)
+    base_dir = _load_dir.get()
+    if path.is_absolute() or base_dir is None:
+        return path
+    return base_dir / path
+
+
+@contextlib.contextmanager
+def _loading(base_dir, name):
+    """Set the directory for resolve_path and log validation failures of name."""
+    token = _load_dir.set(Path(base_dir).absolute() if base_dir is not None else None)
+    try:
+        yield
+    except ValidationError:
+        logger.exception("Failed to validate %s", name)
+        raise
+    finally:
+        _load_dir.reset(token)
+
+
+class LoadResult(NamedTuple):
+    """Outcome of loading one file with BidDSJsonBaseModel.load_many"""
+
+    filename: str
+    model: Any = None
+    error: Optional[Exception] = None
+
+
+class ValidatorInfo(NamedTuple):
+    """Identifies a validator of a data model for validator hooks"""
+
+    name: str
+    """Qualified name, e.g. "Bus.vm_lb_le_init" """
+    kind: str
+    """"field", "pre_root" or "root" """
+    field: Optional[str] = None
+    """Name of the validated field of a field validator"""
+    level: str = "object"
+    """Validation level the validator belongs to (see datamodel.levels)"""
+
+
+# Hooks called around every validator of the data models, innermost last
+_validator_hooks = contextvars.ContextVar("validator_hooks", default=())
+
+# All data model classes, and the number of active validator_hook contexts.
+# Validators are only wrapped while a hook is active so that validation
+# without hooks has no overhead.
+_models = []
+_hook_users = 0
+_hook_lock = threading.Lock()
+
+
+@contextlib.contextmanager
+def validator_hook(hook):
+    """Call hook around every validator of the data models within the context.
+    The hook is called as hook(info, cls, call), where info is a ValidatorInfo,
+    cls the model class being validated and call() runs the validator (and
+    any hooks entered after this one) and returns its result. The hook must
+    return the result of call() for validation to proceed normally, or
+    call.value to skip the validator: the value being validated, which is the
+    dict of values for a root validator.
+    """
+    global _hook_users
+    with _hook_lock:
+        if _hook_users == 0:
+            for model in _models:
+                _set_hooked(model, True)
+        _hook_users += 1
+    token = _validator_hooks.set(_validator_hooks.get() + (hook,))
+    try:
+        yield
+    finally:
+        _validator_hooks.reset(token)
+        with _hook_lock:
+            _hook_users -= 1
+            if _hook_users == 0:
+                for model in _models:
+                    _set_hooked(model, False)
+
+
+def _hooked(func, info):
+    """Wrap a validator function so that it runs through the active hooks."""
+    if getattr(func, "__validator_info__", None) is not None:
+        # inherited from a base class, already wrapped
+        return func
+
+    @functools.wraps(func)
+    def wrapper(cls, *args, **kwargs):
+        hooks = _validator_hooks.get()
+        if not hooks:
+            return func(cls, *args, **kwargs)
+        value = args[0]
+        call = functools.partial(func, cls, *args, **kwargs)
+        for hook in reversed(hooks):
+            call.value = value
+            call = functools.partial(hook, info, cls, call)
+        return call()
+
+    wrapper.__validator_info__ = info
+    wrapper.__unhooked__ = func
+    return wrapper
+
+
+def _unhooked(func):
+    return getattr(func, "__unhooked__", func)
+
+
+def _set_hooked(cls, hooked):
+    """Wrap (or unwrap) all validators of the model class."""
+    def wrap(func, kind, field=None):
+        if not hooked:
+            return _unhooked(func)
+        level = getattr(func, "__validation_level__", "field" if kind == "field" else "object")
+        return _hooked(func, ValidatorInfo(func.__qualname__, kind, field, level))
+
+    def wrap_field(field):
+        for validator in field.class_validators.values():
+            validator.func = wrap(validator.func, "field", field.name)
+        for sub_field in field.sub_fields or ():
+            wrap_field(sub_field)
+        field.populate_validators()
+
+    for field in cls.__fields__.values():
+        wrap_field(field)
+    cls.__pre_root_validators__ = [wrap(func, "pre_root") for func in cls.__pre_root_validators__]
+    cls.__post_root_validators__ = [
+        (skip_on_failure, wrap(func, "root")) for skip_on_failure, func in cls.__post_root_validators__]
+
+
+# Edits of the active bulk_edit context, if any
+_bulk_edit = contextvars.ContextVar("bulk_edit", default=None)
+
+
+class _BulkEdit:
+    """Field assignments made within a bulk_edit context, validated together at its end"""
+
+    def __init__(self):
+        # id of each edited object: (object, {field name: value before the first edit}, fields set before,
+        # dirty fields before)
+        self.edits = {}
+
+    def set(self, obj, name, value):
+        if name not in obj.__fields__:
+            raise ValueError(f'"{obj.__class__.__name__}" object has no field "{name}"')
+        edit = self.edits.get(id(obj))
+        if edit is None:
+            dirty = obj._dirty_fields
+            edit = self.edits[id(obj)] = (obj, {}, set(obj.__fields_set__), None if dirty is None else set(dirty))
+        edit[1].setdefault(name, obj.__dict__.get(name))
+        obj.__dict__[name] = value
+        obj.__fields_set__.add(name)
+
+    @staticmethod
+    def undo(edit):
+        obj, original, fields_set, dirty = edit
+        obj.__dict__.update(original)
+        object.__setattr__(obj, "__fields_set__", fields_set)
+        object.__setattr__(obj, "_dirty_fields", dirty)
+
+    def undo_all(self):
+        for edit in self.edits.values():
+            self.undo(edit)
+
+    def validate(self, root):
+        """Validate each edited object once. The edits of the objects that
+        fail are undone, and all failures are raised in one ValidationError
+        with locations relative to root."""
+        failures = []
+        for edit in self.edits.values():
+            errors = _validate_edited(edit[0], edit[1])
+            if errors:
+                self.undo(edit)
+                failures.append((edit[0], errors))
+        if failures:
+            locations = _object_locations(root)
+            raise ValidationError([
+                ErrorWrapper(ValidationError(errors, obj.__class__),
+                             loc=locations.get(id(obj), (obj.__class__.__name__,)))
+                for obj, errors in failures], root.__class__)
+
+
+def _validate_edited(obj, names):
+    """Validate the edited fields and the root validators of obj as
+    assignment validation does, setting the validated values.
+    Returns the list of errors."""
+    cls = obj.__class__
+    values = dict(obj.__dict__)
+    try:
+        for validator in cls.__pre_root_validators__:
+            values = validator(cls, values)
+    except (ValueError, TypeError, AssertionError) as exc:
+        return [ErrorWrapper(exc, loc=ROOT_KEY)]
+
+    errors = []
+    for name in names:
+        value, error = cls.__fields__[name].validate(values[name], values, loc=name, cls=cls)
+        if error:
+            errors.append(error)
+        else:
+            values[name] = value
+    if errors:
+        return errors
+    for skip_on_failure, validator in cls.__post_root_validators__:
+        if skip_on_failure and errors:
+            continue
+        try:
+            values = validator(cls, values)
+        except (ValueError, TypeError, AssertionError) as exc:
+            errors.append(ErrorWrapper(exc, loc=ROOT_KEY))
+    if not errors:
+        object.__setattr__(obj, "__dict__", values)
+    return expand_batch_errors(errors)
+
+
+def _object_locations(model, loc=(), locations=None):
+    """Return {id(obj): location} for model and all models nested in it."""
+    if locations is None:
+        locations = {}
+    locations[id(model)] = loc
+    for name, alias, is_list in _nested_model_fields(model.__class__):
+        value = getattr(model, name, None)
+        if value is None:
+            continue
+        if is_list:
+            for i, item in enumerate(value):
+                _object_locations(item, loc + (alias, i), locations)
+        else:
+            _object_locations(value, loc + (alias,), locations)
+    return locations
+
+
+@functools.lru_cache(maxsize=None)
+def _nested_model_fields(cls):
+    """(name, alias, is_list) of the fields of cls that hold data models."""
+    result = []
+    for name, field in cls.__fields__.items():
+        sub = submodel_field(field)
+        if sub is not None:
+            result.append((name, field.alias, sub[1]))
+    return result
+
+
+def _dirty_objects(model, loc, holder, result):
+    """Append (location, object, dirty field names, holder) for the objects
+    with dirty fields in model, where holder is the model holding the object
+    in a single (not list) field, if any."""
+    dirty = model._dirty_fields
+    if dirty:
+        result.append((loc, model, dirty, holder))
+    for name, alias, is_list in _nested_model_fields(model.__class__):
+        value = getattr(model, name, None)
+        if value is None:
+            continue
+        if is_list:
+            for i, item in enumerate(value):
+                _dirty_objects(item, loc + (alias, i), None, result)
+        else:
+            _dirty_objects(value, loc + (alias,), (loc, model), result)
+    return result
+
 
 class BidDSJsonBaseModel(BaseModel):
     """Base data model for all dsgrid data models"""
@@ -24,36 +314,433 @@ class BidDSJsonBaseModel(BaseModel):
         arbitrary_types_allowed = True
         allow_population_by_field_name = True
 
+    # names of the fields edited since the model was built or last revalidated
+    _dirty_fields: Optional[set] = PrivateAttr(default=None)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        with _hook_lock:
+            _models.append(cls)
+            # validators inherited while hooks are active are already wrapped
+            _set_hooked(cls, _hook_users > 0)
+
+    def __setattr__(self, name, value):
+        if name in self.__private_attributes__:
+            return super().__setattr__(name, value)
+        edits = _bulk_edit.get()
+        if edits is None:
+            super().__setattr__(name, value)
+        else:
+            edits.set(self, name, value)
+        self.mark_dirty(name)
+
+    def mark_dirty(self, *names):
+        """Record fields as edited, so that revalidate checks them.
+        Assignments are recorded automatically; call this after changing a
+        field in place, e.g. appending to a list of components.
+        """
+        if self._dirty_fields is None:
+            object.__setattr__(self, "_dirty_fields", set(names))
+        else:
+            self._dirty_fields.update(names)
+
+    def dirty_objects(self):
+        """Return [(location, object, field names)] for this model and the
+        models nested in it that have fields edited since they were built or
+        last revalidated."""
+        return [(loc, obj, names) for loc, obj, names, holder in _dirty_objects(self, (), None, [])]
+
+    def revalidate(self):
+        """Re-run the checks affected by the edits since the model was built
+        or last revalidated: for each edited object, the validators of the
+        edited fields and its root validators, and the root validators of
+        the model holding it in a single field (e.g. a Bus when its
+        initial_status was edited, since they compare fields of both).
+        Failures are raised in one ValidationError, and the edits stay
+        recorded until the checks pass.
+        """
+        checks = {}
+        dirty = _dirty_objects(self, (), None, [])
+        for loc, obj, names, holder in dirty:
+            checks[id(obj)] = (loc, obj, set(names))
+        for loc, obj, names, holder in dirty:
+            if holder is not None and id(holder[1]) not in checks:
+                checks[id(holder[1])] = (holder[0], holder[1], set())
+        self._add_affected_checks(checks)
+
+        errors = []
+        for loc, obj, names in checks.values():
+            obj_errors = _validate_edited(obj, names)
+            if obj_errors:
+                errors.append(ErrorWrapper(ValidationError(obj_errors, obj.__class__), loc=loc))
+        if errors:
+            raise ValidationError(errors, self.__class__)
+        for loc, obj, names, holder in dirty:
+            object.__setattr__(obj, "_dirty_fields", None)
+
+    def _add_affected_checks(self, checks):
+        """Add the models whose root validators are affected by the edits in
+        checks, {id(obj): (location, obj, edited field names)}, beyond the
+        edited objects and their holders. For subclasses with checks across
+        objects."""
+
+    @contextlib.contextmanager
+    def bulk_edit(self):
+        """Assign fields of this model and the models in it without
+        validating each assignment. On exit, each edited object is validated
+        once, with the edited fields and its root validators, and all
+        failures are raised in one ValidationError located relative to this
+        model. The edits of the objects that fail are undone, and if the block
+        raises, all edits are undone.
+        Assignments to any data model in the same thread or context are
+        deferred while the block runs. Nested bulk_edit blocks join the
+        outermost one.
+
+        Example
+        -------
+        with problem_data.bulk_edit():
+            for device in problem_data.network.simple_dispatchable_device:
+                device.p_ramp_up_ub *= scale
+        """
+        if _bulk_edit.get() is not None:
+            yield
+            return
+        edits = _BulkEdit()
+        token = _bulk_edit.set(edits)
+        try:
+            yield
+        except BaseException:
+            edits.undo_all()
+            raise
+        finally:
+            _bulk_edit.reset(token)
+        edits.validate(self)
+
     @classmethod
-    def load(cls, filename):
+    def load(cls, filename, streaming=False, backend=None, trusted=False, cache=None,
+             include=None, uids=None, parallel=False, level="full"):
         """Load a data model from a file.
-        Temporarily changes to the file's parent directory so that Pydantic
-        validators can load relative file paths within the file.
+        Relative file paths within the file can be resolved against the
+        file's parent directory with `resolve_path`. The process working
+        directory is not changed, so it is safe to load files concurrently.
         Parameters
         ----------
         filename : str
+            May be compressed with gzip, bz2 or xz (see datamodel.compression),
+            or a sharded directory or its manifest, whose shards are read in
+            parallel and checked against the manifest (see datamodel.sharded)
+        streaming : bool
+            If True, parse the file incrementally and validate each component
+            as it is read instead of decoding the whole file first. This
+            lowers peak memory on large files. Compressed files are then
+            decompressed chunk by chunk and never held in memory in full.
+        backend : str
+            Name of the JSON backend used to decode the file when not
+            streaming (see datamodel.jsonbackends)
+        trusted : bool
+            If True, the file is known to be valid (e.g. it was written by
+            save from a validated model) and the model tree is built with
+            construct_tree, skipping all validation.
+        cache : datamodel.cache.ModelCache
+            If given, return the cached snapshot when the file content has
+            been loaded before, and cache the model otherwise.
+        include : collection of str
+            Dotted paths of the fields to build, e.g. {"network.bus", "reliability"}.
+            Everything else is skipped (see datamodel.selective.build_selected).
+        uids : collection of str, or dict of str to collection of str
+            uids of the records to build in the included lists, either for
+            all lists or per dotted list path
+        parallel : bool or int
+            If True or a number of worker processes, validate large lists of
+            components in a process pool (see datamodel.parallel.build_parallel)
+        level : str
+            Validation level: "schema", "field", "object", "cross" or "full"
+            (see datamodel.levels). Validators above the level are skipped.
+            Models are cached per level, and apart from those loaded trusted.
+
+        Of include (or uids), parallel, cache, trusted and streaming, only
+        cache and trusted can be combined. Other combinations raise
+        ValueError, as does trusted with a level other than "full".
         """
-        filename = Path(filename)
-        base_dir = filename.parent.absolute()
-        orig = os.getcwd()
-        os.chdir(base_dir)
-        try:
-            cfg = cls(**load_data(filename.name))
+        from datamodel.levels import FULL, SCHEMA, build_schema, check_level, validation_level
+        from datamodel.sharded import is_sharded, read_sharded, shard_directory
+
+        check_level(level)
+        options = [name for name, used in (
+            ("include", include is not None or uids is not None), ("parallel", bool(parallel)),
+            ("cache", cache is not None), ("trusted", trusted), ("streaming", streaming)) if used]
+        if len(options) > 1 and options != ["cache", "trusted"]:
+            raise ValueError(f"load does not support combining {', '.join(options)}")
+        if trusted and level != FULL:
+            raise ValueError("trusted loads skip all validation and do not support level")
+
+        filename = Path(filename).absolute()
+        read = load_data
+        if is_sharded(filename):
+            if streaming or cache is not None:
+                raise ValueError("streaming and cache are not supported for sharded data files")
+            filename = shard_directory(filename)
+            read = read_sharded
+        with _loading(filename.parent, filename), validation_level(level):
+            if include is not None or uids is not None:
+                from datamodel.selective import build_selected
+
+                cfg = build_selected(cls, read(filename, backend=backend), include, uids)
+            elif parallel:
+                from datamodel.parallel import build_parallel
+
+                workers = None if parallel is True else parallel
+                cfg = build_parallel(cls, read(filename, backend=backend), workers=workers, level=level)
+            elif cache is not None:
+                cfg = cache.load(cls, filename, backend=backend, trusted=trusted, level=level)
+            elif trusted:
+                cfg = cls.construct_tree(read(filename, backend=backend))
+            elif streaming:
+                cfg = load_data_streaming(cls, filename)
+            elif level == SCHEMA:
+                cfg = build_schema(cls, read(filename, backend=backend))
+            else:
+                cfg = cls(**read(filename, backend=backend))
             return cfg
-        except ValidationError:
-            logger.exception("Failed to validate %s", filename)
-            raise
-        finally:
-            os.chdir(orig)
 
+    @classmethod
+    def load_bytes(cls, data, backend=None, trusted=False, base_dir=None):
+        """Load a data model from json held in memory.
+        Parameters
+        ----------
+        data : bytes or str
+            May be compressed with gzip, bz2 or xz
+        backend : str
+            Name of the JSON backend used to decode the data
+        trusted : bool
+            If True, skip validation (see load)
+        base_dir : str
+            Directory that resolve_path resolves relative paths against.
+            Defaults to the current working directory.
+        Returns
+        -------
+        cls instance
+        """
+        if not isinstance(data, str):
+            data = decompress(data)
+        with _loading(base_dir, "<bytes>"):
+            return build_model(cls, jsonbackends.loads(data, backend=backend), trusted=trusted)
+
+    @classmethod
+    def load_stream(cls, stream, streaming=False, backend=None, trusted=False, base_dir=None):
+        """Load a data model from a readable file object, e.g. a pipe.
+        The stream is read to its end but not closed.
+        Parameters
+        ----------
+        stream : file object
+            Text or binary. Compressed binary streams are detected from
+            their magic bytes (see datamodel.compression.open_stream).
+        streaming : bool
+            If True, parse and validate incrementally as in load
+        backend : str
+            Name of the JSON backend used to decode the data when not streaming
+        trusted : bool
+            If True, skip validation (see load)
+        base_dir : str
+            Directory that resolve_path resolves relative paths against
+        Returns
+        -------
+        cls instance
+        """
+        name = getattr(stream, "name", "<stream>")
+        with _loading(base_dir, name):
+            if not streaming or trusted:
+                data = stream.read()
+                if not isinstance(data, str):
+                    data = decompress(data)
+                return build_model(cls, jsonbackends.loads(data, backend=backend), trusted=trusted)
+
+            from datamodel.streaming import load_model_streaming
+
+            text = stream if isinstance(stream, io.TextIOBase) else open_stream(stream, "rt")
+            try:
+                return load_model_streaming(cls, text)
+            finally:
+                if text is not stream:
+                    # do not close the caller's stream along with the wrapper
+                    text.detach()
+
+    @classmethod
+    def load_mmap(cls, filename, backend=None, trusted=False):
+        """Load a data model from a memory-mapped file.
+        With the orjson backend the json is parsed directly from the mapped
+        pages, without reading the file into a separate buffer. This suits
+        files on shared storage or in the page cache. Other backends copy the
+        mapping to bytes first, and compressed files are decompressed in
+        memory.
+        Parameters
+        ----------
+        filename : str
+        backend : str
+            Name of the JSON backend used to decode the file
+        trusted : bool
+            If True, skip validation (see load)
+        Returns
+        -------
+        cls instance
+        """
+        filename = Path(filename).absolute()
+        with _loading(filename.parent, filename):
+            with open(filename, "rb") as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if compression_from_magic(mapped[:8]) is not None:
+                    data = jsonbackends.loads(decompress(mapped[:]), backend=backend)
+                else:
+                    with memoryview(mapped) as view:
+                        data = jsonbackends.loads_buffer(view, backend=backend)
+            logger.debug("Loaded data from %s", filename)
+            return build_model(cls, data, trusted=trusted)
+
+    @classmethod
+    def validate_report(cls, filename, max_per_rule=None, max_errors=None, backend=None):
+        """Run every check on a file and report all failures instead of
+        raising on the first invalid model.
+        Parameters
+        ----------
+        filename : str
+        max_per_rule : int
+            Maximum number of failures listed per rule (default 20)
+        max_errors : int
+            Maximum number of failures listed in total (default 1000)
+        backend : str
+            Name of the JSON backend used to decode the file
+        Returns
+        -------
+        datamodel.report.ValidationReport
+            Lists the failures with their location, uid, rule and values,
+            and holds the model if the file is valid
+        """
+        from datamodel import report
+
+        caps = {}
+        if max_per_rule is not None:
+            caps["max_per_rule"] = max_per_rule
+        if max_errors is not None:
+            caps["max_errors"] = max_errors
+        filename = Path(filename).absolute()
+        with _loading(filename.parent, filename):
+            return report.build_report(cls, load_data(filename, backend=backend), **caps)
+
+    @classmethod
+    def load_lazy(cls, filename, backend=None):
+        """Load a data model from a file, deferring validation of each
+        top-level section until it is first accessed.
+        Parameters
+        ----------
+        filename : str
+        backend : str
+            Name of the JSON backend used to decode the file
+        Returns
+        -------
+        datamodel.lazy.LazyDataFile
+            Sections are validated with relative paths resolved against the
+            directory of filename, as in load
+        """
+        from datamodel.lazy import LazyDataFile
+
+        filename = Path(filename).absolute()
+        with _loading(filename.parent, filename):
+            return LazyDataFile(cls, load_data(filename, backend=backend), base_dir=filename.parent)
 
-    def save(cls, filename):
+    @classmethod
+    def construct_tree(cls, data):
+        """Build a data model from trusted data without any validation.
+        Like pydantic's construct, but recurses into nested models and lists
+        of models so that the whole tree is made of model objects. Values are
+        used as given, so e.g. fields typed as tuples hold the lists read from
+        json. Saving the result writes the same json as the validated model.
+        Parameters
+        ----------
+        data : dict
+        Returns
+        -------
+        cls instance
+        """
+        values = dict(data)
+        for key, (model, is_list) in submodel_fields(cls).items():
+            value = values.get(key)
+            if value is None:
+                continue
+            if is_list:
+                values[key] = [model.construct_tree(item) for item in value]
+            else:
+                values[key] = model.construct_tree(value)
+        return cls.construct(**values)
+
+    @classmethod
+    def load_many(cls, filenames, workers=None, use_processes=False, **kwargs):
+        """Load and validate several files in parallel.
+        Parameters
+        ----------
+        filenames : list of str
+        workers : int
+            Maximum number of concurrent loads. Defaults to the executor's default.
+        use_processes : bool
+            If True, use a process pool instead of a thread pool. Validation is
+            CPU bound, so processes scale better with cores, at the cost of
+            pickling each loaded model back to the parent process.
+        kwargs : passed to load
+        Returns
+        -------
+        list of LoadResult
+            One result per file, in the order of filenames. Failures are
+            returned in LoadResult.error rather than raised.
+        """
+        executor_cls = concurrent.futures.ProcessPoolExecutor if use_processes \
+            else concurrent.futures.ThreadPoolExecutor
+        filenames = [str(filename) for filename in filenames]
+        with executor_cls(max_workers=workers) as executor:
+            futures = [executor.submit(_load_one, cls, filename, kwargs) for filename in filenames]
+            results = []
+            for filename, future in zip(filenames, futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    # e.g. the worker process died or the result could not be pickled
+                    results.append(LoadResult(filename, error=e))
+        return results
+
+
+    def save(cls, filename, compact=False, backend=None, decimals=None, checksum=False, sharded=False,
+             compression=None):
         """
         Save a data model to a file
         TODO: Valiodate that the model matches the schema (typically an output model)
         Parameters
         ----------
         filename : str
+            Compressed with gzip, bz2 or xz if the name ends in .gz, .bz2 or .xz
+        compact : bool
+            If True, write the json without indentation or whitespace, which
+            is smaller and faster to write. Otherwise indent by 4 spaces.
+        backend : str
+            Name of a JSON backend (see datamodel.jsonbackends) to encode the
+            whole model with at once. By default the model is written as it
+            is walked by datamodel.writer.write_model, without building its
+            dict first, which gives the same output faster and with less memory.
+        decimals : int
+            If given, round floats to this number of decimals as they are
+            written, which makes files of solutions much smaller (see
+            datamodel.writer.round_values). Not supported with backend.
+        checksum : bool
+            If True, also write the SHA-256 of the file to filename.sha256
+            (see datamodel.atomic.verify_checksum)
+        sharded : bool
+            If True, filename is a directory to write one file per section
+            and per list of components to, in parallel, with a manifest
+            (see datamodel.sharded). Not supported with backend.
+        compression : str
+            With sharded, one of the datamodel.compression.CODECS names to
+            compress every shard with
+
+        The file is written to a temporary file next to it and renamed into
+        place once complete, so an interrupted save leaves the previous file
+        as it was (see datamodel.atomic.atomic_write).
         """
 
         def bools_to_int(dic):
@@ -84,74 +771,51 @@ class BidDSJsonBaseModel(BaseModel):
                     if isinstance(value,dict) or isinstance(value,list):
                         bools_to_int(value)
 
-        def round_floats(dic,dec_places):
-            """
-            Convert all the floats to a certain decimal accuracy
-            Works recursively using pass by reference
-            Parameters
-            ----------
-            dic: dictionary or list
-    
-            Returns
-            --------
-            dic: dictionary
-            """
-            if isinstance(dic,dict):
-                for key,value in dic.items():
-                    if isinstance(value,float):
-                        dic[key] = round(value,dec_places)
-                    if isinstance(value,dict) or isinstance(value,list):
-                        round_floats(value,dec_places)
-        
-            if isinstance(dic,list):
-                for i in range(len(dic)):
-                    value = dic[i]
-                    if isinstance(value,float):
-                        dic[i] = round(value,dec_places)
-                    if isinstance(value,tuple):
-                        tmp = list(value)
-                        for j in range(len(tmp)):
-                            if isinstance(tmp[j],float):
-                                tmp[j] = round(tmp[j],dec_places)
-                        value = tuple(tmp)
-                        dic[i] = value
-                    if isinstance(value,dict) or isinstance(value,list):
-                        round_floats(value,dec_places)
-
-
+        if decimals is not None and backend is not None:
+            raise ValueError("decimals is only supported without backend")
+        if sharded:
+            if backend is not None:
+                raise ValueError("sharded is only supported without backend")
+            from datamodel.sharded import save_sharded
 
+            save_sharded(type(cls), cls, filename, compact=compact, decimals=decimals, compression=compression,
+                         checksum=checksum)
+            return
         filename = Path(filename)
         try:
             # TODO: Check if this validates. If not do a validation
-            json_model = cls.dict(exclude_unset=True)
-            bools_to_int(json_model)
-            with open(filename,'w') as file_pointer:
-                json.dump(json_model,file_pointer,indent=4)
+            indent = None if compact else 4
+            if backend is None:
+                with atomic_write(filename,'wt',checksum=checksum) as file_pointer:
+                    write_model(cls, file_pointer, indent=indent, decimals=decimals)
+            else:
+                json_model = cls.dict(exclude_unset=True)
+                bools_to_int(json_model)
+                text = jsonbackends.dumps(json_model, indent=indent, backend=backend, compact=compact)
+                with atomic_write(filename,'wt',checksum=checksum) as file_pointer:
+                    file_pointer.write(text)
         except ValidationError:
             logger.exception("Failed to validate %s", filename)
-        except IOError:
-            raise(f"Problem writing file {filename}")
+        except IOError as e:
+            raise IOError(f"Problem writing file {filename}") from e
 
 
     @classmethod
-    def schema_json(cls, by_alias=True, indent=None) -> str:
+    def schema_json(cls, by_alias=True, indent=None, backend=None) -> str:
         data = cls.schema(by_alias=by_alias)
-        return json.dumps(data, indent=indent, cls=ExtendedJSONEncoder)
+        return jsonbackends.dumps(data, indent=indent, backend=backend)
 
     @classmethod
-    def save_schema(cls, filename, by_alias=True, indent=None):
-        with open(filename, 'w') as f:
-            f.write(cls.schema_json(by_alias=by_alias, indent=indent))
+    def save_schema(cls, filename, by_alias=True, indent=None, backend=None, checksum=False):
+        """Write the json schema of the model, replacing filename only once
+        complete (see save)."""
+        with atomic_write(filename, 'wt', compression=None, checksum=checksum) as f:
+            f.write(cls.schema_json(by_alias=by_alias, indent=indent, backend=backend))
 
 
 class ExtendedJSONEncoder(json.JSONEncoder):
     def default(self, obj):
-        if isinstance(obj, datetime):
-            return isoformat(obj)
-        if isinstance(obj, timedelta):
-            return timedelta_isoformat(obj)
-
-        return json.JSONEncoder.default(self, obj)
+        return jsonbackends.json_default(obj)
 
 # TEMPORARY: Initial hand-written example. Delete when have new framework working.
 
@@ -192,22 +856,101 @@ class ExtendedJSONEncoder(json.JSONEncoder):
 #     )
 
 
-def load_data(filename, **kwargs):
+def _load_one(cls, filename, kwargs):
+    try:
+        return LoadResult(filename, model=cls.load(filename, **kwargs))
+    except Exception as e:
+        return LoadResult(filename, error=e)
+
+
+def build_model(cls, data, trusted=False):
+    """Build a data model from decoded json, validating it unless trusted."""
+    return cls.construct_tree(data) if trusted else cls(**data)
+
+
+def load_data(filename, backend=None, **kwargs):
     """Load data from the file.
     Supports JSON, TOML, or custom via kwargs.
+    Files compressed with gzip, bz2 or xz are decompressed on the fly; the
+    codec is detected from the extension or the magic bytes. They are
+    decompressed and decoded chunk by chunk (see datamodel.streaming.read_data),
+    so the decompressed text is never held in memory in full next to the
+    decoded data.
     Parameters
     ----------
     filename : str
+    backend : str
+        Name of the JSON backend to use for uncompressed files (see
+        datamodel.jsonbackends). Defaults to the fastest available one.
+        Compressed files are decoded with the stdlib json decoder.
     Returns
     -------
     dict
     """
-    with open(filename) as f_in:
+    compression = detect_compression(filename)
+    try:
+        if compression is None:
+            with open(filename, 'rb') as f_in:
+                data = jsonbackends.loads(f_in.read(), backend=backend)
+        else:
+            from datamodel.streaming import read_data
+
+            with open_file(filename, 'rt', compression=compression) as f_in:
+                data = read_data(f_in)
+    except OSError:
+        raise
+    except Exception:
+        logger.exception("Failed to load data from %s", filename)
+        raise
+
+    logger.debug("Loaded data from %s", filename)
+    return data
+
+
+def submodel_field(field):
+    """Return (model class, is_list) if field holds data models, otherwise None."""
+    type_ = field.type_
+    if not (isinstance(type_, type) and issubclass(type_, BidDSJsonBaseModel)):
+        return None
+    if field.shape == SHAPE_SINGLETON:
+        return type_, False
+    if field.shape == SHAPE_LIST:
+        return type_, True
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def submodel_fields(cls):
+    """Return {alias: (model class, is_list)} for the fields of cls that hold data models."""
+    result = {}
+    for field in cls.__fields__.values():
+        sub = submodel_field(field)
+        if sub is not None:
+            result[field.alias] = sub
+    return result
+
+
+def load_data_streaming(cls, filename, **kwargs):
+    """Load a data model from the file without holding the raw data tree in memory.
+    Parameters
+    ----------
+    cls : BidDSJsonBaseModel subclass
+    filename : str
+    kwargs : passed to datamodel.streaming.load_model_streaming
+    Returns
+    -------
+    cls instance
+    """
+    from datamodel.streaming import load_model_streaming
+
+    with open_file(filename, 'rt') as f_in:
         try:
-            data = json.load(f_in)
+            model = load_model_streaming(cls, f_in, **kwargs)
+        except ValidationError:
+            raise
         except Exception:
             logger.exception("Failed to load data from %s", filename)
             raise
 
     logger.debug("Loaded data from %s", filename)
-    return data
+    return model
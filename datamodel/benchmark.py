@@ -0,0 +1,245 @@
+"""Benchmarks for loading and saving GO-3 data files.
+
+Run from the command line, e.g.
+
+    python datamodel/benchmark.py backends path/to/case.json
+    python datamodel/benchmark.py conditionals path/to/case.json
+    python datamodel/benchmark.py validators path/to/case.json --output validators.json
+    python datamodel/benchmark.py decimals path/to/solution.json --model output
+"""
+import argparse
+import functools
+import logging
+import os
+import tempfile
+import time
+
+from datamodel import jsonbackends
+from datamodel.base import load_data, submodel_fields
+
+logger = logging.getLogger(__name__)
+
+
+def best_time(func, repeat=3):
+    """Return the fastest of repeat calls to func, in seconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def benchmark_backends(filename, repeat=3):
+    """Time decoding and encoding filename with every available JSON backend.
+    Parameters
+    ----------
+    filename : str
+    repeat : int
+    Returns
+    -------
+    list of dict
+        One record per backend with decode, encode (indent=4) and compact
+        encode times in seconds, and the speedup of each over stdlib json
+    """
+    with open(filename, "rb") as f:
+        raw = f.read()
+    data = jsonbackends.loads(raw, backend="json")
+
+    results = []
+    for name in jsonbackends.available_backends():
+        backend = jsonbackends.get_backend(name)
+        results.append({
+            "backend": name,
+            "decode": best_time(lambda: backend.loads(raw), repeat),
+            "encode": best_time(lambda: jsonbackends.dumps(data, indent=4, backend=backend), repeat),
+            "encode_compact": best_time(lambda: jsonbackends.dumps(data, backend=backend, compact=True), repeat),
+        })
+
+    baseline = next(result for result in results if result["backend"] == "json")
+    for result in results:
+        for key in ("decode", "encode", "encode_compact"):
+            result[f"{key}_speedup"] = baseline[key] / result[key]
+    return results
+
+
+@functools.lru_cache(maxsize=None)
+def _unfused_model(model):
+    """Return a subclass of model whose conditional element checks are the
+    per-element root validators generated by create.py before they were
+    fused into check_conditionals, and those validators."""
+    from pydantic import root_validator
+
+    from datamodel.create import separate_conditional_validators
+
+    elements = {element: dependency for dependency, group in model.__conditional_elements__.items()
+                for element in group}
+    name = f"Unfused{model.__name__}"
+    namespace = {"__name__": __name__, "model": model, "root_validator": root_validator}
+    exec(f"class {name}(model):\n    pass\n" + separate_conditional_validators(elements), namespace)
+    unfused = namespace[name]
+    unfused.__post_root_validators__ = [
+        (skip_on_failure, func) for skip_on_failure, func in unfused.__post_root_validators__
+        if func.__name__ != "check_conditionals"]
+    separate = [func for _, func in unfused.__post_root_validators__ if func.__name__.startswith("check_conditional_")]
+    return unfused, separate
+
+
+def benchmark_conditionals(filename, repeat=3):
+    """Time the conditional element checks of the network components, fused
+    into one validator per model versus one validator per element.
+    Parameters
+    ----------
+    filename : str
+        An input data file
+    repeat : int
+    Returns
+    -------
+    list of dict
+        One record per component type with the time per object in
+        microseconds of the conditional checks alone and of validating the
+        whole object, separate ("before") and fused ("after")
+    """
+    from datamodel.input.sections import Network
+
+    network = load_data(filename)["network"]
+    results = []
+    for key, (model, is_list) in submodel_fields(Network).items():
+        conditional_elements = getattr(model, "__conditional_elements__", None)
+        items = network.get(key)
+        if not conditional_elements or not items:
+            continue
+        unfused, separate = _unfused_model(model)
+
+        values = [model.parse_obj(item).__dict__ for item in items]
+        n = len(items)
+        per_object = 1e6 / n
+        results.append({
+            "model": model.__name__,
+            "objects": n,
+            "checks_before_us": per_object * best_time(
+                lambda: [check(model, v) for v in values for check in separate], repeat),
+            "checks_after_us": per_object * best_time(
+                lambda: [model.check_conditionals(v) for v in values], repeat),
+            "validate_before_us": per_object * best_time(lambda: [unfused.parse_obj(item) for item in items], repeat),
+            "validate_after_us": per_object * best_time(lambda: [model.parse_obj(item) for item in items], repeat),
+        })
+    return results
+
+
+def profile_load(filename, output=None, top=None):
+    """Load an input data file with the validators profiled.
+    Parameters
+    ----------
+    filename : str
+    output : str
+        If given, save the report to this file (JSON if it ends with .json)
+    top : int
+        Number of validators listed in the returned text
+    Returns
+    -------
+    str
+        The text report, with the total load time for comparison
+    """
+    from datamodel.input.data import InputDataFile
+    from datamodel.profiling import profile_validators
+
+    start = time.perf_counter()
+    with profile_validators(output) as profile:
+        InputDataFile.load(filename)
+    elapsed = time.perf_counter() - start
+    return f"load: {elapsed:.3f} s, of which validators: " + profile.format(top=top)
+
+
+def benchmark_decimals(filename, model="input", decimals=(None, 10, 8, 6, 4, 2), compact=False, repeat=3):
+    """Time saving a data file with floats rounded to several numbers of
+    decimals, and measure the size of the output.
+    Parameters
+    ----------
+    filename : str
+    model : str
+        "input" or "output", the data model of the file
+    decimals : sequence of int or None
+        None saves the floats at full precision
+    compact : bool
+    repeat : int
+    Returns
+    -------
+    list of dict
+        One record per setting with the write time in seconds, the size in
+        MB and both relative to full precision
+    """
+    if model == "input":
+        from datamodel.input.data import InputDataFile as cls
+    else:
+        from datamodel.output.data import OutputDataFile as cls
+    data = cls.load(filename, level="schema")
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "out.json")
+        for k in decimals:
+            seconds = best_time(lambda: data.save(path, compact=compact, decimals=k), repeat)
+            results.append({"decimals": "full" if k is None else k, "write": seconds,
+                            "size_mb": os.path.getsize(path) / 1e6})
+    for result in results:
+        result["write_ratio"] = result["write"] / results[0]["write"]
+        result["size_ratio"] = result["size_mb"] / results[0]["size_mb"]
+    return results
+
+
+def _print_table(rows, columns):
+    print("  ".join(f"{column:>16}" for column in columns))
+    for row in rows:
+        cells = []
+        for column in columns:
+            value = row[column]
+            cells.append(f"{value:>16.4f}" if isinstance(value, float) else f"{value!s:>16}")
+        print("  ".join(cells))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    backends_parser = subparsers.add_parser("backends", help="JSON decode/encode time per backend")
+    backends_parser.add_argument("filename")
+    backends_parser.add_argument("--repeat", type=int, default=3)
+
+    conditionals_parser = subparsers.add_parser(
+        "conditionals", help="Per-object time of the conditional element checks, separate vs fused")
+    conditionals_parser.add_argument("filename")
+    conditionals_parser.add_argument("--repeat", type=int, default=3)
+
+    validators_parser = subparsers.add_parser(
+        "validators", help="Calls and time per validator while loading an input data file")
+    validators_parser.add_argument("filename")
+    validators_parser.add_argument("--output", help="Also save the report, as JSON if the name ends with .json")
+    validators_parser.add_argument("--top", type=int, default=30, help="Number of validators listed")
+
+    decimals_parser = subparsers.add_parser(
+        "decimals", help="Save time and file size when rounding floats to a number of decimals")
+    decimals_parser.add_argument("filename")
+    decimals_parser.add_argument("--model", choices=["input", "output"], default="input")
+    decimals_parser.add_argument("--decimals", type=int, nargs="+", default=[10, 8, 6, 4, 2])
+    decimals_parser.add_argument("--compact", action="store_true")
+    decimals_parser.add_argument("--repeat", type=int, default=3)
+
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    if args.benchmark == "backends":
+        rows = benchmark_backends(args.filename, repeat=args.repeat)
+        _print_table(rows, ["backend", "decode", "decode_speedup", "encode", "encode_speedup",
+                            "encode_compact", "encode_compact_speedup"])
+    elif args.benchmark == "conditionals":
+        rows = benchmark_conditionals(args.filename, repeat=args.repeat)
+        _print_table(rows, ["model", "objects", "checks_before_us", "checks_after_us",
+                            "validate_before_us", "validate_after_us"])
+    elif args.benchmark == "validators":
+        print(profile_load(args.filename, output=args.output, top=args.top))
+    elif args.benchmark == "decimals":
+        rows = benchmark_decimals(args.filename, model=args.model, decimals=[None] + args.decimals,
+                                  compact=args.compact, repeat=args.repeat)
+        _print_table(rows, ["decimals", "write", "write_ratio", "size_mb", "size_ratio"])
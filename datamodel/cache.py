@@ -0,0 +1,185 @@
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+from pathlib import Path
+
+import pydantic
+
+from datamodel import format_version, jsonbackends
+from datamodel.compression import decompress
+from datamodel.levels import SCHEMA, build_schema, validation_level
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 4 * 1024 ** 3
+SNAPSHOT_SUFFIX = ".pickle"
+
+
+def default_cache_dir():
+    base_dir = os.environ.get("XDG_CACHE_HOME") or (Path.home() / ".cache")
+    return Path(base_dir) / "go3-datamodel"
+
+
+class ModelCache:
+    """On-disk cache of validated data models keyed by file content.
+
+    The key is a hash of the file's bytes together with the data model class,
+    the data format version, the pydantic version and how the model was
+    built (validated, or trusted and built without validation, and the
+    validation level), so an entry is only reused for the exact same input,
+    model definition and checks. In particular a model built from a trusted
+    file is never returned to a load that asks for validation. Entries are pickled
+    snapshots of the validated model and load without json parsing or
+    validation. Once the cache grows beyond max_bytes, the least recently
+    used entries are removed.
+
+    Snapshots are unpickled on load, so the cache directory must only be
+    writable by trusted users.
+
+    Parameters
+    ----------
+    directory : str
+        Defaults to $XDG_CACHE_HOME/go3-datamodel (~/.cache/go3-datamodel)
+    max_bytes : int
+        Maximum total size of the snapshots
+    """
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = Path(directory) if directory is not None else default_cache_dir()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+    def key(self, cls, data, trusted=False, level="full"):
+        """Return the cache key for loading the bytes data as cls, with
+        trusted and level as for BidDSJsonBaseModel.load."""
+        h = hashlib.sha256()
+        for part in (cls.__module__, cls.__qualname__, format_version, pydantic.VERSION,
+                     "trusted" if trusted else level):
+            h.update(str(part).encode("utf-8"))
+            h.update(b"\0")
+        h.update(data)
+        return h.hexdigest()
+
+    def _path(self, key):
+        return self.directory / (key + SNAPSHOT_SUFFIX)
+
+    def get(self, key):
+        """Return the model stored under key, or None."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                model = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            logger.warning("Discarding unreadable cache entry %s", path, exc_info=True)
+            self._remove(path)
+            return None
+        try:
+            # record the use for LRU eviction
+            os.utime(path)
+        except OSError:
+            pass
+        return model
+
+    def put(self, key, model):
+        """Store model under key, then evict entries if over the size limit."""
+        path = self._path(key)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(model, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except BaseException:
+            self._remove(Path(tmp))
+            raise
+        self.evict()
+
+    def load(self, cls, filename, backend=None, trusted=False, level="full"):
+        """Load filename as cls, using the cached snapshot if the file is unchanged.
+        Parameters
+        ----------
+        cls : BidDSJsonBaseModel subclass
+        filename : str
+        backend : str
+            JSON backend used on a cache miss
+        trusted : bool
+            If True, skip validation on a cache miss (see BidDSJsonBaseModel.construct_tree).
+            Such models are cached apart from validated ones.
+        level : str
+            Validation level on a cache miss (see datamodel.levels). Models
+            are cached apart per level.
+        Returns
+        -------
+        cls instance
+        """
+        with open(filename, "rb") as f:
+            data = f.read()
+        key = self.key(cls, data, trusted=trusted, level=level)
+        model = self.get(key)
+        if isinstance(model, cls):
+            logger.debug("Loaded %s from cache entry %s", filename, key)
+            return model
+
+        # build from the bytes that were hashed so that the entry always
+        # matches its key, even if the file changes in the meantime
+        raw = jsonbackends.loads(decompress(data), backend=backend)
+        del data
+        if trusted:
+            model = cls.construct_tree(raw)
+        elif level == SCHEMA:
+            model = build_schema(cls, raw)
+        else:
+            with validation_level(level):
+                model = cls(**raw)
+        self.put(key, model)
+        return model
+
+    def invalidate(self, cls, filename, trusted=False, level="full"):
+        """Remove the entry for the current content of filename, if any.
+        Returns
+        -------
+        bool
+            True if an entry was removed
+        """
+        with open(filename, "rb") as f:
+            key = self.key(cls, f.read(), trusted=trusted, level=level)
+        return self._remove(self._path(key))
+
+    def clear(self):
+        """Remove all entries."""
+        for path in self._entries():
+            self._remove(path)
+
+    def size(self):
+        """Total size of the entries in bytes."""
+        return sum(path.stat().st_size for path in self._entries())
+
+    def evict(self):
+        """Remove the least recently used entries until the cache fits in max_bytes."""
+        entries = []
+        for path in self._entries():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total <= self.max_bytes:
+                break
+            if self._remove(path):
+                total -= size
+
+    def _entries(self):
+        return list(self.directory.glob("*" + SNAPSHOT_SUFFIX))
+
+    @staticmethod
+    def _remove(path):
+        try:
+            path.unlink()
+            return True
+        except FileNotFoundError:
+            return False
@@ -0,0 +1,130 @@
+import bz2
+import gzip
+import io
+import logging
+import lzma
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# name: (file extensions, magic bytes at the start of the file, open, decompress)
+CODECS = {
+    "gzip": ((".gz", ".gzip"), b"\x1f\x8b", gzip.open, gzip.decompress),
+    "bz2": ((".bz2",), b"BZh", bz2.open, bz2.decompress),
+    "xz": ((".xz", ".lzma"), b"\xfd7zXZ\x00", lzma.open, lzma.decompress),
+}
+
+
+def compression_from_extension(filename):
+    """Return the name of the codec implied by the file extension, or None."""
+    suffix = Path(filename).suffix.lower()
+    for name, (extensions, _, _, _) in CODECS.items():
+        if suffix in extensions:
+            return name
+    return None
+
+
+def compression_from_magic(data):
+    """Return the name of the codec whose magic bytes start data, or None."""
+    for name, (_, magic, _, _) in CODECS.items():
+        if data.startswith(magic):
+            return name
+    return None
+
+
+def detect_compression(filename):
+    """Return the name of the codec used by an existing file, or None.
+    The extension is checked first, then the magic bytes at the start of the file.
+    """
+    name = compression_from_extension(filename)
+    if name is not None:
+        return name
+    with open(filename, "rb") as f:
+        return compression_from_magic(f.read(8))
+
+
+def open_file(filename, mode="rb", compression="infer", encoding=None):
+    """Open a possibly compressed file, streaming through its codec.
+    Parameters
+    ----------
+    filename : str
+    mode : str
+        As for open, e.g. "rb", "rt", "wb" or "wt"
+    compression : str
+        "infer" to detect the codec (from the extension, and when reading
+        also from the magic bytes), None for an uncompressed file, or one of
+        the CODECS names
+    encoding : str
+        Text encoding for text modes. Defaults to utf-8.
+    Returns
+    -------
+    file object
+    """
+    if compression == "infer":
+        if "r" in mode:
+            compression = detect_compression(filename)
+        else:
+            compression = compression_from_extension(filename)
+    if "b" not in mode and encoding is None:
+        encoding = "utf-8"
+    if compression is None:
+        return open(filename, mode, encoding=encoding)
+    if compression not in CODECS:
+        raise ValueError(f"Unsupported compression {compression!r}. Supported: {list(CODECS)}")
+    if "b" not in mode and "t" not in mode:
+        mode += "t"
+    logger.debug("Opening %s with %s compression", filename, compression)
+    return CODECS[compression][2](filename, mode, encoding=encoding)
+
+
+def decompress(data):
+    """Decompress bytes if they start with a known codec's magic bytes."""
+    name = compression_from_magic(data)
+    if name is None:
+        return data
+    return CODECS[name][3](data)
+
+
+class _StreamReader(io.RawIOBase):
+    """Raw reader over a binary file object, which is not closed along with it."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self.stream.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def open_stream(stream, mode="rb", encoding=None):
+    """Wrap a readable binary stream (e.g. a pipe) to decompress it on the fly.
+    The codec is detected from the magic bytes. Streams without peek, e.g.
+    io.BytesIO, are read through a buffer to look at them.
+    Parameters
+    ----------
+    stream : binary file object
+    mode : str
+        "rb" or "rt"
+    encoding : str
+        Text encoding for "rt". Defaults to utf-8.
+    Returns
+    -------
+    file object
+    """
+    if "b" not in mode and encoding is None:
+        encoding = "utf-8"
+    if not hasattr(stream, "peek"):
+        stream = io.BufferedReader(_StreamReader(stream))
+    name = compression_from_magic(stream.peek(8))
+    if name is not None:
+        logger.debug("Reading stream with %s compression", name)
+        if "b" not in mode and "t" not in mode:
+            mode += "t"
+        return CODECS[name][2](stream, mode, encoding=encoding)
+    if "b" in mode:
+        return stream
+    return io.TextIOWrapper(stream, encoding=encoding)
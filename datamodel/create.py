@@ -264,18 +264,13 @@ def get_objects_from_table(object_name, astr):
         static_inner_objects = None
     else:
         if len(static_conditional_elements) > 0:
-            for conditional_element, dependency in static_conditional_elements.items():
-                # values is a dict. need to use values.get(key), not values[key]
-                #static_result+= f"""\n    @root_validator(pre=False)\n    def check_conditional_{conditional_element}(cls, values):\n        if values["{dependency}"] == 1 and values["{conditional_element}"] is None:\n             raise ValueError("Conditional element {conditional_element} is missing when {dependency} is 1")\n        if values["{dependency}"] != 1 and values["{conditional_element}"] is not None:\n             raise ValueError("Conditional element {conditional_element} is present when {dependency} is not 1")\n        return values"""
-                static_result+= f"""\n    @root_validator(pre=False)\n    def check_conditional_{conditional_element}(cls, values):\n        if values.get("{dependency}") is not None and values.get("{dependency}") == 1 and values.get("{conditional_element}") is None:\n             raise ValueError("Conditional element {conditional_element} is missing when {dependency} is 1")\n        if values.get("{dependency}") is not None and values.get("{dependency}") != 1 and values.get("{conditional_element}") is not None:\n             raise ValueError("Conditional element {conditional_element} is present when {dependency} is not 1")\n        return values"""
-                             
+            static_result += conditional_validator(static_conditional_elements)                             
     if not has_timeseries:
         timeseries_result = None
         timeseries_inner_objects = None
     else:
         if len(timeseries_conditional_elements) > 0:
-            for conditional_element, dependency in timeseries_conditional_elements.items():
-                static_result+= f"""\n    @root_validator(pre=False)\n    def check_conditional_{conditional_element}(cls, values):\n        if values.get("{dependency}") is not None and values.get("{dependency}") == 1 and values.get("{conditional_element}") is None:\n             raise ValueError("Conditional element {conditional_element} is missing when {dependency} is 1")\n        if values.get("{dependency}") is not None and values.get("{dependency}") != 1 and values.get("{conditional_element}") is not None:\n             raise ValueError("Conditional element {conditional_element} is present when {dependency} is not 1")\n        return values"""
+            static_result += conditional_validator(timeseries_conditional_elements)
 
     if not has_reliability:
         reliability_result = None
@@ -305,6 +300,65 @@ types_map = {
     "Binary": "conint(ge=0, le=1, strict=True)",
 }
 
+def conditional_validator(conditional_elements):
+    """
+    Generate one root validator that checks all conditional elements of a
+    model in a single pass, grouped by the flag they depend on. Conditional
+    elements must be present when their flag is 1 and absent otherwise.
+    Parameters
+    ----------
+    conditional_elements: dict
+        conditional element name -> name of the flag it depends on
+
+    Returns
+    --------
+    str: code of the __conditional_elements__ attribute and the validator
+    """
+    groups = {}
+    for conditional_element, dependency in conditional_elements.items():
+        groups[dependency] = groups.get(dependency, ()) + (conditional_element,)
+
+    result = f"\n    __conditional_elements__ = {groups!r}\n"
+    result += "\n    @root_validator(pre=False)\n    def check_conditionals(cls, values):\n        errors = []"
+    for dependency, elements in groups.items():
+        result += f"""
+        dependency = values.get("{dependency}")
+        if dependency == 1:
+            for element in {elements}:
+                if values.get(element) is None:
+                    errors.append("Conditional element {{}} is missing when {dependency} is 1".format(element))
+        elif dependency is not None:
+            for element in {elements}:
+                if values.get(element) is not None:
+                    errors.append("Conditional element {{}} is present when {dependency} is not 1".format(element))"""
+    result += """
+        if errors:
+            raise ValueError("; ".join(errors))
+        return values"""
+    return result
+
+
+def separate_conditional_validators(conditional_elements):
+    """
+    Generate one root validator per conditional element, as create.py did
+    before the checks were fused into check_conditionals. Not used for the
+    models; datamodel/benchmark.py builds the models of before from it.
+    Parameters
+    ----------
+    conditional_elements: dict
+        conditional element name -> name of the flag it depends on
+
+    Returns
+    --------
+    str: code of the validators
+    """
+    result = ""
+    for conditional_element, dependency in conditional_elements.items():
+        # values is a dict. need to use values.get(key), not values[key]
+        result+= f"""\n    @root_validator(pre=False)\n    def check_conditional_{conditional_element}(cls, values):\n        if values.get("{dependency}") is not None and values.get("{dependency}") == 1 and values.get("{conditional_element}") is None:\n             raise ValueError("Conditional element {conditional_element} is missing when {dependency} is 1")\n        if values.get("{dependency}") is not None and values.get("{dependency}") != 1 and values.get("{conditional_element}") is not None:\n             raise ValueError("Conditional element {conditional_element} is present when {dependency} is not 1")\n        return values"""
+    return result
+
+
 def parse_field(ln,object_name,is_conditional=False):
     name, desc, req, sec, sym = ln.split("&")
     sec = sec.strip()
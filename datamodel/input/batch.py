@@ -0,0 +1,49 @@
+"""Per-object rules of the network components, evaluated for whole lists at once.
+
+Each rule names a batchable root validator in datamodel.input.static and
+gives the columns it reads and a vectorized test for candidate failures.
+"""
+
+from datamodel.validation import BatchRule
+
+FROM_TO_BUS_RULES = [
+    BatchRule("fbus_ne_tbus", ("fr_bus", "to_bus"), lambda fr, to: fr == to),
+]
+
+BRANCH_RULES = FROM_TO_BUS_RULES + [
+    BatchRule("mva_ub_nom_le_em", ("mva_ub_nom", "mva_ub_em"), lambda nom, em: ~(nom <= em)),
+    BatchRule("r_ne_0_or_x_ne_0", ("r", "x"), lambda r, x: ~(abs(r) + abs(x) > 0)),
+]
+
+# Network field: rules for the components in it
+NETWORK_RULES = {
+    "bus": [
+        BatchRule("vm_lb_le_init", ("vm_lb", "initial_status.vm"), lambda lb, v0: ~(lb <= v0)),
+        BatchRule("vm_init_le_ub", ("vm_ub", "initial_status.vm"), lambda ub, v0: ~(v0 <= ub)),
+    ],
+    "shunt": [
+        BatchRule("step_lb_le_init", ("step_lb", "initial_status.step"), lambda lb, u0: ~(lb <= u0)),
+        BatchRule("step_init_le_ub", ("step_ub", "initial_status.step"), lambda ub, u0: ~(u0 <= ub)),
+    ],
+    "simple_dispatchable_device": [
+        BatchRule("q_linear_or_bound_cap_but_not_both", ("q_linear_cap", "q_bound_cap"),
+                  lambda linear, bound: (linear > 0) & (bound > 0)),
+    ],
+    "ac_line": BRANCH_RULES,
+    "two_winding_transformer": BRANCH_RULES + [
+        BatchRule("tm_le_tm_ub", ("tm_ub", "initial_status.tm"), lambda ub, tm: ~(tm <= ub)),
+        BatchRule("tm_ge_tm_lb", ("tm_lb", "initial_status.tm"), lambda lb, tm: ~(tm >= lb)),
+        BatchRule("ta_le_ta_ub", ("ta_ub", "initial_status.ta"), lambda ub, ta: ~(ta <= ub)),
+        BatchRule("ta_ge_ta_lb", ("ta_lb", "initial_status.ta"), lambda lb, ta: ~(ta >= lb)),
+        BatchRule("tm_or_ta_lb_eq_ub", ("tm_ub", "tm_lb", "ta_ub", "ta_lb"),
+                  lambda tm_ub, tm_lb, ta_ub, ta_lb: (tm_lb < tm_ub) & (ta_lb < ta_ub)),
+    ],
+    "dc_line": FROM_TO_BUS_RULES + [
+        BatchRule("pdc_fr_le_pdc_ub", ("pdc_ub", "initial_status.pdc_fr"), lambda ub, p: ~(p <= ub)),
+        BatchRule("pdc_fr_ge_minus_pdc_ub", ("pdc_ub", "initial_status.pdc_fr"), lambda ub, p: ~(p >= -ub)),
+        BatchRule("qdc_fr_le_qdc_fr_ub", ("qdc_fr_ub", "initial_status.qdc_fr"), lambda ub, q: ~(q <= ub)),
+        BatchRule("qdc_fr_ge_qdc_fr_lb", ("qdc_fr_lb", "initial_status.qdc_fr"), lambda lb, q: ~(q >= lb)),
+        BatchRule("qdc_to_le_qdc_to_ub", ("qdc_to_ub", "initial_status.qdc_to"), lambda ub, q: ~(q <= ub)),
+        BatchRule("qdc_to_ge_qdc_to_lb", ("qdc_to_lb", "initial_status.qdc_to"), lambda lb, q: ~(q >= lb)),
+    ],
+}
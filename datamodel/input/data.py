@@ -1,7 +1,72 @@
 import logging
-from pydantic import root_validator, validator
+from pydantic import ValidationError, root_validator, validator
 from datamodel.input.database import *
+from datamodel.input.integrity import affects_cross_checks, alignment_failures, integrity_failures, time_series_index
+from datamodel.levels import cross_check
+from datamodel.validation import BatchValidationError, expand_batch_errors
 
 class InputDataFile(InputDataFileBase):
 
-    pass
+    def __init__(__pydantic_self__, **data):
+
+        # the uid, reference and alignment failures are reported at the
+        # location of each failing component, as for the network rules
+        try:
+            super().__init__(**data)
+        except ValidationError as e:
+            raise ValidationError(expand_batch_errors(e.raw_errors), e.model) from None
+
+    @root_validator
+    @cross_check
+    def uids_unique_and_references_exist(cls, data):
+
+        network = data.get("network")
+        reliability = data.get("reliability")
+        if network is not None:
+            failures = integrity_failures(network, reliability)
+            if failures:
+                raise BatchValidationError(failures)
+        return data
+
+    @root_validator
+    @cross_check
+    def time_series_aligned_with_network(cls, data):
+
+        network = data.get("network")
+        time_series_input = data.get("time_series_input")
+        if (network is not None) and (time_series_input is not None):
+            failures, index = alignment_failures(network, time_series_input)
+            if failures:
+                raise BatchValidationError(failures)
+            time_series_input._network_index = index
+        return data
+
+    def _add_affected_checks(self, checks):
+
+        # the uid, reference and alignment checks are root validators of the data file
+        if id(self) not in checks and any(affects_cross_checks(obj, names) for loc, obj, names in checks.values()):
+            checks[id(self)] = ((), self, set())
+
+    def get_time_series_index(self, key, refresh=False):
+        """Return the position in time_series_input.<key> of the time series
+        of each component in network.<key>, e.g.
+        time_series_input.simple_dispatchable_device[index[i]] is the time
+        series of network.simple_dispatchable_device[i].
+        The index is computed during validation and reused.
+        Parameters
+        ----------
+        key : str
+            "simple_dispatchable_device", "active_zonal_reserve" or "reactive_zonal_reserve"
+        refresh : bool
+            If True, compute the index again, e.g. after editing either list
+        Returns
+        -------
+        list of int
+        """
+        index = self.time_series_input._network_index
+        if index is None:
+            index = {}
+            self.time_series_input._network_index = index
+        if refresh or key not in index:
+            index[key] = time_series_index(getattr(self.network, key), getattr(self.time_series_input, key))
+        return index[key]
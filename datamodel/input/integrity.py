@@ -0,0 +1,162 @@
+"""Cross-reference integrity checks of an input data file.
+
+Each uid list is indexed once in a hash set or dict, so all checks together
+take time linear in the size of the data.
+"""
+
+import functools
+
+from pydantic.fields import SHAPE_LIST
+
+from datamodel.validation import RuleFailure
+
+# Network field: fields of its components that hold the uid of a bus
+BUS_REFERENCES = {
+    "shunt": ("bus",),
+    "simple_dispatchable_device": ("bus",),
+    "ac_line": ("fr_bus", "to_bus"),
+    "two_winding_transformer": ("fr_bus", "to_bus"),
+    "dc_line": ("fr_bus", "to_bus"),
+}
+
+# Bus field: Network field of the reserve zones it refers to
+RESERVE_REFERENCES = {
+    "active_reserve_uids": "active_zonal_reserve",
+    "reactive_reserve_uids": "reactive_zonal_reserve",
+}
+
+# Network fields of the components that can be in a contingency
+CONTINGENCY_COMPONENTS = ("ac_line", "two_winding_transformer", "dc_line")
+
+# Fields that are in both the network and the time series input, linked by uid
+TIME_SERIES_COMPONENTS = ("simple_dispatchable_device", "active_zonal_reserve", "reactive_zonal_reserve")
+
+# Fields of any component read by the checks across components, besides the time series
+CROSS_CHECK_FIELDS = frozenset(
+    ("uid", "components", "time_periods") + tuple(RESERVE_REFERENCES)
+    + tuple(field for fields in BUS_REFERENCES.values() for field in fields))
+
+# Network fields in the order of Network.get_uids
+NETWORK_COMPONENTS = (
+    "bus", "shunt", "simple_dispatchable_device", "ac_line", "two_winding_transformer",
+    "dc_line", "active_zonal_reserve", "reactive_zonal_reserve")
+
+
+def _uids(network, key):
+    return {item.uid for item in getattr(network, key)}
+
+
+def unique_uid_failures(network):
+    """Return a RuleFailure for each component whose uid is already used
+    by an earlier component of the network."""
+    failures = []
+    first = {}
+    for key in NETWORK_COMPONENTS:
+        for i, item in enumerate(getattr(network, key)):
+            loc = ("network", key, i)
+            other = first.setdefault(item.uid, loc)
+            if other is not loc:
+                msg = "fails uid unique. uid: {}, first used by: {}".format(
+                    item.uid, ".".join(str(part) for part in other))
+                failures.append(RuleFailure(loc, item.uid, "uid_unique", msg, {"uid": item.uid}))
+    return failures
+
+
+def reference_failures(network, reliability=None):
+    """Return a RuleFailure for each reference to a uid that does not exist."""
+    failures = []
+    bus_uids = _uids(network, "bus")
+    for key, fields in BUS_REFERENCES.items():
+        for i, item in enumerate(getattr(network, key)):
+            for field in fields:
+                value = getattr(item, field)
+                if value not in bus_uids:
+                    msg = "fails {} in bus uids. {}: {}".format(field, field, value)
+                    failures.append(RuleFailure(("network", key, i), item.uid, f"{field}_exists", msg, {field: value}))
+
+    for field, key in RESERVE_REFERENCES.items():
+        reserve_uids = _uids(network, key)
+        for i, bus in enumerate(network.bus):
+            missing = [uid for uid in getattr(bus, field) if uid not in reserve_uids]
+            if missing:
+                msg = "fails {} in {} uids. missing: {}".format(field, key, missing)
+                failures.append(RuleFailure(("network", "bus", i), bus.uid, f"{field}_exist", msg, {field: missing}))
+
+    if reliability is not None:
+        component_uids = set()
+        for key in CONTINGENCY_COMPONENTS:
+            component_uids.update(_uids(network, key))
+        for i, contingency in enumerate(reliability.contingency):
+            missing = [uid for uid in contingency.components if uid not in component_uids]
+            if missing:
+                msg = "fails components in {} uids. missing: {}".format(
+                    " or ".join(CONTINGENCY_COMPONENTS), missing)
+                failures.append(RuleFailure(("reliability", "contingency", i), contingency.uid,
+                                            "components_exist", msg, {"components": missing}))
+    return failures
+
+
+def integrity_failures(network, reliability=None):
+    """Return all uniqueness and reference failures of the data file sections."""
+    return unique_uid_failures(network) + reference_failures(network, reliability)
+
+
+@functools.lru_cache(maxsize=None)
+def series_fields(model):
+    """Names of the fields of model that hold one entry per time period."""
+    return tuple(name for name, field in model.__fields__.items() if field.shape == SHAPE_LIST)
+
+
+def affects_cross_checks(obj, names):
+    """Whether editing the fields names of obj can change the result of
+    integrity_failures or alignment_failures. Conservative: edits of any list
+    field count, as the time series are lists."""
+    return not CROSS_CHECK_FIELDS.isdisjoint(names) or not set(series_fields(type(obj))).isdisjoint(names)
+
+
+def time_series_index(static_items, time_series_items):
+    """Return index such that time_series_items[index[i]] has the uid of
+    static_items[i], with None where there is no such item."""
+    positions = {item.uid: j for j, item in enumerate(time_series_items)}
+    return [positions.get(item.uid) for item in static_items]
+
+
+def alignment_failures(network, time_series_input):
+    """Check that the network and the time series input have the same
+    components and that every time series has one entry per time period.
+    Returns
+    -------
+    failures : list of RuleFailure
+    index : dict
+        For each of TIME_SERIES_COMPONENTS, the time_series_index of the
+        network components in the time series input
+    """
+    failures = []
+    index = {}
+    time_periods = time_series_input.general.time_periods
+    for key in TIME_SERIES_COMPONENTS:
+        static_items = getattr(network, key)
+        series_items = getattr(time_series_input, key)
+        index[key] = time_series_index(static_items, series_items)
+
+        matched = [False] * len(series_items)
+        for i, j in enumerate(index[key]):
+            if j is None:
+                msg = "fails uid in time_series_input.{} uids. uid: {}".format(key, static_items[i].uid)
+                failures.append(RuleFailure(("network", key, i), static_items[i].uid, "uid_in_time_series", msg,
+                                            {"uid": static_items[i].uid}))
+            else:
+                matched[j] = True
+        for j, item in enumerate(series_items):
+            if not matched[j]:
+                # either not in the network or a duplicate uid
+                msg = "fails uid in network.{} uids, once. uid: {}".format(key, item.uid)
+                failures.append(RuleFailure(("time_series_input", key, j), item.uid, "uid_in_network", msg, {"uid": item.uid}))
+            for name in series_fields(type(item)):
+                length = len(getattr(item, name))
+                if length != time_periods:
+                    msg = "fails len({}) == time_periods. len({}): {}, time_periods: {}".format(
+                        name, name, length, time_periods)
+                    failures.append(RuleFailure(("time_series_input", key, j), item.uid, f"len_{name}_eq_time_periods",
+                                                msg, {f"len({name})": length, "time_periods": time_periods}))
+    return failures, index
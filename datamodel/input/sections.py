@@ -1,8 +1,45 @@
 import logging
+from pydantic import PrivateAttr, ValidationError, root_validator
+
+from datamodel.input.batch import NETWORK_RULES
 from datamodel.input.sectionsbase import *
+from datamodel.validation import (BatchValidationError, check_batch, deferred_validation, expand_batch_errors,
+                                  flatten_errors, is_deferred)
 
 class Network(NetworkBase):
 
+    def __init__(__pydantic_self__, **data):
+
+        # the per-object rules of the components are checked in batch by
+        # components_pass_batch_rules once all components are built, and
+        # their failures are reported at the location of each component
+        try:
+            with deferred_validation():
+                super().__init__(**data)
+        except ValidationError as e:
+            if not any(error.loc_tuple()[0] in NETWORK_RULES for error in flatten_errors(e.raw_errors)):
+                raise ValidationError(expand_batch_errors(e.raw_errors), e.model) from None
+        else:
+            return
+        # a list checked in batch failed, so its valid components were not
+        # checked: build again checking each component on its own
+        super().__init__(**data)
+
+    @root_validator
+    def components_pass_batch_rules(cls, data):
+
+        if not is_deferred():
+            # the components were checked one by one
+            return data
+        failures = []
+        for key, rules in NETWORK_RULES.items():
+            items = data.get(key)
+            if items:
+                failures.extend(check_batch(cls.__fields__[key].type_, items, rules, loc=(key,)))
+        if failures:
+            raise BatchValidationError(failures)
+        return data
+
     def get_bus_uids(self):
 
         return [i.uid for i in self.bus]
@@ -50,6 +87,10 @@ class Network(NetworkBase):
 
 class TimeSeriesInput(TimeSeriesInputBase):
 
+    # position of each network component's time series, set by InputDataFile
+    # (see InputDataFile.get_time_series_index)
+    _network_index: Optional[dict] = PrivateAttr(default=None)
+
     def get_simple_dispatchable_device_uids(self):
 
         return [i.uid for i in self.simple_dispatchable_device]
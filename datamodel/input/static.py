@@ -2,6 +2,7 @@ import logging
 from pydantic import root_validator, validator
 
 from datamodel.input.staticbase import *
+from datamodel.validation import batchable
 
 class General(GeneralBase):
 
@@ -66,6 +67,7 @@ class Bus(BusBase):
         return data            
 
     @root_validator
+    @batchable
     def vm_lb_le_init(cls, data):
 
         lb = data.get("vm_lb")
@@ -81,6 +83,7 @@ class Bus(BusBase):
         return data
 
     @root_validator
+    @batchable
     def vm_init_le_ub(cls, data):
 
         ub = data.get("vm_ub")
@@ -105,6 +108,7 @@ class Shunt(ShuntBase):
         return data
 
     @root_validator
+    @batchable
     def step_lb_le_init(cls, data):
 
         lb = data.get("step_lb")
@@ -118,6 +122,7 @@ class Shunt(ShuntBase):
         return data
 
     @root_validator
+    @batchable
     def step_init_le_ub(cls, data):
 
         ub = data.get("step_ub")
@@ -356,6 +361,7 @@ class DispatchableDevices_SimpleProducingConsumingDevices(DispatchableDevices_Si
         return data
 
     @root_validator
+    @batchable
     def q_linear_or_bound_cap_but_not_both(cls, data):
 
         linear = data.get("q_linear_cap")
@@ -369,6 +375,7 @@ class DispatchableDevices_SimpleProducingConsumingDevices(DispatchableDevices_Si
 class ACTransmissionLine(ACTransmissionLineBase):
     
     @root_validator
+    @batchable
     def fbus_ne_tbus(cls, data):
 
         fr = data.get("fr_bus")
@@ -397,6 +404,7 @@ class ACTransmissionLine(ACTransmissionLineBase):
         return data            
     
     @root_validator
+    @batchable
     def mva_ub_nom_le_em(cls, data):
 
         nom = data.get("mva_ub_nom")
@@ -408,6 +416,7 @@ class ACTransmissionLine(ACTransmissionLineBase):
         return data
     
     @root_validator
+    @batchable
     def r_ne_0_or_x_ne_0(cls, data):
 
         r = data.get("r")
@@ -420,6 +429,7 @@ class ACTransmissionLine(ACTransmissionLineBase):
 class TwoWindingTransformer(TwoWindingTransformerBase):
     
     @root_validator
+    @batchable
     def fbus_ne_tbus(cls, data):
 
         fr = data.get("fr_bus")
@@ -448,6 +458,7 @@ class TwoWindingTransformer(TwoWindingTransformerBase):
         return data            
     
     @root_validator
+    @batchable
     def mva_ub_nom_le_em(cls, data):
 
         nom = data.get("mva_ub_nom")
@@ -459,6 +470,7 @@ class TwoWindingTransformer(TwoWindingTransformerBase):
         return data
     
     @root_validator
+    @batchable
     def r_ne_0_or_x_ne_0(cls, data):
 
         r = data.get("r")
@@ -469,6 +481,7 @@ class TwoWindingTransformer(TwoWindingTransformerBase):
         return data
     
     @root_validator
+    @batchable
     def tm_le_tm_ub(cls, data):
 
         tm_ub = data.get("tm_ub")
@@ -481,6 +494,7 @@ class TwoWindingTransformer(TwoWindingTransformerBase):
         return data
     
     @root_validator
+    @batchable
     def tm_ge_tm_lb(cls, data):
 
         tm_lb = data.get("tm_lb")
@@ -493,6 +507,7 @@ class TwoWindingTransformer(TwoWindingTransformerBase):
         return data
     
     @root_validator
+    @batchable
     def ta_le_ta_ub(cls, data):
 
         ta_ub = data.get("ta_ub")
@@ -505,6 +520,7 @@ class TwoWindingTransformer(TwoWindingTransformerBase):
         return data
     
     @root_validator
+    @batchable
     def ta_ge_ta_lb(cls, data):
 
         ta_lb = data.get("ta_lb")
@@ -517,6 +533,7 @@ class TwoWindingTransformer(TwoWindingTransformerBase):
         return data
 
     @root_validator
+    @batchable
     def tm_or_ta_lb_eq_ub(cls, data):
         
         tm_ub = data.get("tm_ub")
@@ -542,6 +559,7 @@ class TwoWindingTransformer(TwoWindingTransformerBase):
 class DCLine(DCLineBase):
     
     @root_validator
+    @batchable
     def fbus_ne_tbus(cls, data):
 
         fr = data.get("fr_bus")
@@ -552,6 +570,7 @@ class DCLine(DCLineBase):
         return data
     
     @root_validator
+    @batchable
     def pdc_fr_le_pdc_ub(cls, data):
 
         pdc_ub = data.get("pdc_ub")
@@ -565,6 +584,7 @@ class DCLine(DCLineBase):
         return data
     
     @root_validator
+    @batchable
     def pdc_fr_ge_minus_pdc_ub(cls, data):
 
         pdc_ub = data.get("pdc_ub")
@@ -578,6 +598,7 @@ class DCLine(DCLineBase):
         return data
     
     @root_validator
+    @batchable
     def qdc_fr_le_qdc_fr_ub(cls, data):
 
         qdc_fr_ub = data.get("qdc_fr_ub")
@@ -591,6 +612,7 @@ class DCLine(DCLineBase):
         return data
     
     @root_validator
+    @batchable
     def qdc_fr_ge_qdc_fr_lb(cls, data):
 
         qdc_fr_lb = data.get("qdc_fr_lb")
@@ -604,6 +626,7 @@ class DCLine(DCLineBase):
         return data
     
     @root_validator
+    @batchable
     def qdc_to_le_qdc_to_ub(cls, data):
 
         qdc_to_ub = data.get("qdc_to_ub")
@@ -617,6 +640,7 @@ class DCLine(DCLineBase):
         return data
     
     @root_validator
+    @batchable
     def qdc_to_ge_qdc_to_lb(cls, data):
 
         qdc_to_lb = data.get("qdc_to_lb")
@@ -440,47 +440,31 @@ class DispatchableDevices_SimpleProducingConsumingDevicesBase(BidDSJsonBaseModel
         description = "Lower bound for slope of active-reactive capability curve "
     )
 
+    __conditional_elements__ = {'q_linear_cap': ('q_0', 'beta'), 'q_bound_cap': ('q_0_ub', 'q_0_lb', 'beta_ub', 'beta_lb')}
+
     @root_validator(pre=False)
-    def check_conditional_q_0(cls, values):
-        if values.get("q_linear_cap") is not None and values.get("q_linear_cap") == 1 and values.get("q_0") is None:
-             raise ValueError("Conditional element q_0 is missing when q_linear_cap is 1")
-        if values.get("q_linear_cap") is not None and values.get("q_linear_cap") != 1 and values.get("q_0") is not None:
-             raise ValueError("Conditional element q_0 is present when q_linear_cap is not 1")
-        return values
-    @root_validator(pre=False)
-    def check_conditional_beta(cls, values):
-        if values.get("q_linear_cap") is not None and values.get("q_linear_cap") == 1 and values.get("beta") is None:
-             raise ValueError("Conditional element beta is missing when q_linear_cap is 1")
-        if values.get("q_linear_cap") is not None and values.get("q_linear_cap") != 1 and values.get("beta") is not None:
-             raise ValueError("Conditional element beta is present when q_linear_cap is not 1")
-        return values
-    @root_validator(pre=False)
-    def check_conditional_q_0_ub(cls, values):
-        if values.get("q_bound_cap") is not None and values.get("q_bound_cap") == 1 and values.get("q_0_ub") is None:
-             raise ValueError("Conditional element q_0_ub is missing when q_bound_cap is 1")
-        if values.get("q_bound_cap") is not None and values.get("q_bound_cap") != 1 and values.get("q_0_ub") is not None:
-             raise ValueError("Conditional element q_0_ub is present when q_bound_cap is not 1")
-        return values
-    @root_validator(pre=False)
-    def check_conditional_q_0_lb(cls, values):
-        if values.get("q_bound_cap") is not None and values.get("q_bound_cap") == 1 and values.get("q_0_lb") is None:
-             raise ValueError("Conditional element q_0_lb is missing when q_bound_cap is 1")
-        if values.get("q_bound_cap") is not None and values.get("q_bound_cap") != 1 and values.get("q_0_lb") is not None:
-             raise ValueError("Conditional element q_0_lb is present when q_bound_cap is not 1")
-        return values
-    @root_validator(pre=False)
-    def check_conditional_beta_ub(cls, values):
-        if values.get("q_bound_cap") is not None and values.get("q_bound_cap") == 1 and values.get("beta_ub") is None:
-             raise ValueError("Conditional element beta_ub is missing when q_bound_cap is 1")
-        if values.get("q_bound_cap") is not None and values.get("q_bound_cap") != 1 and values.get("beta_ub") is not None:
-             raise ValueError("Conditional element beta_ub is present when q_bound_cap is not 1")
-        return values
-    @root_validator(pre=False)
-    def check_conditional_beta_lb(cls, values):
-        if values.get("q_bound_cap") is not None and values.get("q_bound_cap") == 1 and values.get("beta_lb") is None:
-             raise ValueError("Conditional element beta_lb is missing when q_bound_cap is 1")
-        if values.get("q_bound_cap") is not None and values.get("q_bound_cap") != 1 and values.get("beta_lb") is not None:
-             raise ValueError("Conditional element beta_lb is present when q_bound_cap is not 1")
+    def check_conditionals(cls, values):
+        errors = []
+        dependency = values.get("q_linear_cap")
+        if dependency == 1:
+            for element in ('q_0', 'beta'):
+                if values.get(element) is None:
+                    errors.append("Conditional element {} is missing when q_linear_cap is 1".format(element))
+        elif dependency is not None:
+            for element in ('q_0', 'beta'):
+                if values.get(element) is not None:
+                    errors.append("Conditional element {} is present when q_linear_cap is not 1".format(element))
+        dependency = values.get("q_bound_cap")
+        if dependency == 1:
+            for element in ('q_0_ub', 'q_0_lb', 'beta_ub', 'beta_lb'):
+                if values.get(element) is None:
+                    errors.append("Conditional element {} is missing when q_bound_cap is 1".format(element))
+        elif dependency is not None:
+            for element in ('q_0_ub', 'q_0_lb', 'beta_ub', 'beta_lb'):
+                if values.get(element) is not None:
+                    errors.append("Conditional element {} is present when q_bound_cap is not 1".format(element))
+        if errors:
+            raise ValueError("; ".join(errors))
         return values
 
 class ACTransmissionLineBase(BidDSJsonBaseModel):
@@ -572,33 +556,22 @@ class ACTransmissionLineBase(BidDSJsonBaseModel):
         description = "Susceptance for shunt component at to bus in p.u. "
     )
 
+    __conditional_elements__ = {'additional_shunt': ('g_fr', 'b_fr', 'g_to', 'b_to')}
+
     @root_validator(pre=False)
-    def check_conditional_g_fr(cls, values):
-        if values.get("additional_shunt") is not None and values.get("additional_shunt") == 1 and values.get("g_fr") is None:
-             raise ValueError("Conditional element g_fr is missing when additional_shunt is 1")
-        if values.get("additional_shunt") is not None and values.get("additional_shunt") != 1 and values.get("g_fr") is not None:
-             raise ValueError("Conditional element g_fr is present when additional_shunt is not 1")
-        return values
-    @root_validator(pre=False)
-    def check_conditional_b_fr(cls, values):
-        if values.get("additional_shunt") is not None and values.get("additional_shunt") == 1 and values.get("b_fr") is None:
-             raise ValueError("Conditional element b_fr is missing when additional_shunt is 1")
-        if values.get("additional_shunt") is not None and values.get("additional_shunt") != 1 and values.get("b_fr") is not None:
-             raise ValueError("Conditional element b_fr is present when additional_shunt is not 1")
-        return values
-    @root_validator(pre=False)
-    def check_conditional_g_to(cls, values):
-        if values.get("additional_shunt") is not None and values.get("additional_shunt") == 1 and values.get("g_to") is None:
-             raise ValueError("Conditional element g_to is missing when additional_shunt is 1")
-        if values.get("additional_shunt") is not None and values.get("additional_shunt") != 1 and values.get("g_to") is not None:
-             raise ValueError("Conditional element g_to is present when additional_shunt is not 1")
-        return values
-    @root_validator(pre=False)
-    def check_conditional_b_to(cls, values):
-        if values.get("additional_shunt") is not None and values.get("additional_shunt") == 1 and values.get("b_to") is None:
-             raise ValueError("Conditional element b_to is missing when additional_shunt is 1")
-        if values.get("additional_shunt") is not None and values.get("additional_shunt") != 1 and values.get("b_to") is not None:
-             raise ValueError("Conditional element b_to is present when additional_shunt is not 1")
+    def check_conditionals(cls, values):
+        errors = []
+        dependency = values.get("additional_shunt")
+        if dependency == 1:
+            for element in ('g_fr', 'b_fr', 'g_to', 'b_to'):
+                if values.get(element) is None:
+                    errors.append("Conditional element {} is missing when additional_shunt is 1".format(element))
+        elif dependency is not None:
+            for element in ('g_fr', 'b_fr', 'g_to', 'b_to'):
+                if values.get(element) is not None:
+                    errors.append("Conditional element {} is present when additional_shunt is not 1".format(element))
+        if errors:
+            raise ValueError("; ".join(errors))
         return values
 
 class TwoWindingTransformerBase(BidDSJsonBaseModel):
@@ -710,33 +683,22 @@ class TwoWindingTransformerBase(BidDSJsonBaseModel):
         description = "Susceptance for shunt component at to bus in p.u. "
     )
 
+    __conditional_elements__ = {'additional_shunt': ('g_fr', 'b_fr', 'g_to', 'b_to')}
+
     @root_validator(pre=False)
-    def check_conditional_g_fr(cls, values):
-        if values.get("additional_shunt") is not None and values.get("additional_shunt") == 1 and values.get("g_fr") is None:
-             raise ValueError("Conditional element g_fr is missing when additional_shunt is 1")
-        if values.get("additional_shunt") is not None and values.get("additional_shunt") != 1 and values.get("g_fr") is not None:
-             raise ValueError("Conditional element g_fr is present when additional_shunt is not 1")
-        return values
-    @root_validator(pre=False)
-    def check_conditional_b_fr(cls, values):
-        if values.get("additional_shunt") is not None and values.get("additional_shunt") == 1 and values.get("b_fr") is None:
-             raise ValueError("Conditional element b_fr is missing when additional_shunt is 1")
-        if values.get("additional_shunt") is not None and values.get("additional_shunt") != 1 and values.get("b_fr") is not None:
-             raise ValueError("Conditional element b_fr is present when additional_shunt is not 1")
-        return values
-    @root_validator(pre=False)
-    def check_conditional_g_to(cls, values):
-        if values.get("additional_shunt") is not None and values.get("additional_shunt") == 1 and values.get("g_to") is None:
-             raise ValueError("Conditional element g_to is missing when additional_shunt is 1")
-        if values.get("additional_shunt") is not None and values.get("additional_shunt") != 1 and values.get("g_to") is not None:
-             raise ValueError("Conditional element g_to is present when additional_shunt is not 1")
-        return values
-    @root_validator(pre=False)
-    def check_conditional_b_to(cls, values):
-        if values.get("additional_shunt") is not None and values.get("additional_shunt") == 1 and values.get("b_to") is None:
-             raise ValueError("Conditional element b_to is missing when additional_shunt is 1")
-        if values.get("additional_shunt") is not None and values.get("additional_shunt") != 1 and values.get("b_to") is not None:
-             raise ValueError("Conditional element b_to is present when additional_shunt is not 1")
+    def check_conditionals(cls, values):
+        errors = []
+        dependency = values.get("additional_shunt")
+        if dependency == 1:
+            for element in ('g_fr', 'b_fr', 'g_to', 'b_to'):
+                if values.get(element) is None:
+                    errors.append("Conditional element {} is missing when additional_shunt is 1".format(element))
+        elif dependency is not None:
+            for element in ('g_fr', 'b_fr', 'g_to', 'b_to'):
+                if values.get(element) is not None:
+                    errors.append("Conditional element {} is present when additional_shunt is not 1".format(element))
+        if errors:
+            raise ValueError("; ".join(errors))
         return values
 
 class DCLineBase(BidDSJsonBaseModel):
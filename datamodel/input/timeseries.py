@@ -2,6 +2,7 @@ import logging
 from pydantic import root_validator, validator
 
 from datamodel.input.timeseriesbase import *
+from datamodel.vectorized import check_entries, check_nested_entries
 
 class General(GeneralBase):
 
@@ -20,12 +21,7 @@ class General(GeneralBase):
     @validator("interval_duration")
     def interval_duration_gt_0(cls, data):
 
-        num_t = len(data)
-        idx_err = [i for i in range(num_t) if data[i] <= 0.0]
-        errs = [(i, data[i]) for i in idx_err]
-        if len(idx_err) > 0:
-            msg = "fails entries > 0. failures (index, entry): {}".format(errs)
-            raise ValueError(msg)
+        check_entries(data, ">", 0.0)
         return data
 
 class DispatchableDevices_SimpleProducingConsumingDevices(DispatchableDevices_SimpleProducingConsumingDevicesBase):
@@ -33,23 +29,13 @@ class DispatchableDevices_SimpleProducingConsumingDevices(DispatchableDevices_Si
     @validator("p_lb")
     def p_lb_ge_0(cls, data):
 
-        num_t = len(data)
-        idx_err = [i for i in range(num_t) if data[i] < 0.0]
-        errs = [(i, data[i]) for i in idx_err]
-        if len(idx_err) > 0:
-            msg = "fails entries >= 0. failures (index, entry): {}".format(errs)
-            raise ValueError(msg)
+        check_entries(data, ">=", 0.0)
         return data
 
     @validator("cost")
     def cost_entry_1_ge_0(cls, data):
 
-        num_t = len(data)
-        t_num_h = [len(data[i]) for i in range(num_t)]
-        errs = [(i,j,data[i][j][1]) for i in range(num_t) for j in range(t_num_h[i]) if data[i][j][1] < 0.0]
-        if len(errs) > 0:
-            msg = "fails entries[i][j][1] >= 0. failures (i, j, entry): {}".format(errs)
-            raise ValueError(msg)
+        check_nested_entries(data, 1, ">=", 0.0)
         return data
 
 class ActiveZonalReserveRequirementsViolationCosts(ActiveZonalReserveRequirementsViolationCostsBase):
@@ -57,23 +43,13 @@ class ActiveZonalReserveRequirementsViolationCosts(ActiveZonalReserveRequirement
     @validator("RAMPING_RESERVE_UP")
     def ramping_reserve_up_ge_0(cls, data):
 
-        num_t = len(data)
-        idx_err = [i for i in range(num_t) if data[i] < 0.0]
-        errs = [(i, data[i]) for i in idx_err]
-        if len(idx_err) > 0:
-            msg = "fails entries >= 0. failures (index, entry): {}".format(errs)
-            raise ValueError(msg)
+        check_entries(data, ">=", 0.0)
         return data
 
     @validator("RAMPING_RESERVE_DOWN")
     def ramping_reserve_down_ge_0(cls, data):
 
-        num_t = len(data)
-        idx_err = [i for i in range(num_t) if data[i] < 0.0]
-        errs = [(i, data[i]) for i in idx_err]
-        if len(idx_err) > 0:
-            msg = "fails entries >= 0. failures (index, entry): {}".format(errs)
-            raise ValueError(msg)
+        check_entries(data, ">=", 0.0)
         return data
 
 class ReactiveZonalReserveRequirementsViolationCosts(ReactiveZonalReserveRequirementsViolationCostsBase):
@@ -81,22 +57,12 @@ class ReactiveZonalReserveRequirementsViolationCosts(ReactiveZonalReserveRequire
     @validator("REACT_UP")
     def react_up_ge_0(cls, data):
 
-        num_t = len(data)
-        idx_err = [i for i in range(num_t) if data[i] < 0.0]
-        errs = [(i, data[i]) for i in idx_err]
-        if len(idx_err) > 0:
-            msg = "fails entries >= 0. failures (index, entry): {}".format(errs)
-            raise ValueError(msg)
+        check_entries(data, ">=", 0.0)
         return data
 
     @validator("REACT_DOWN")
     def react_down_ge_0(cls, data):
 
-        num_t = len(data)
-        idx_err = [i for i in range(num_t) if data[i] < 0.0]
-        errs = [(i, data[i]) for i in idx_err]
-        if len(idx_err) > 0:
-            msg = "fails entries >= 0. failures (index, entry): {}".format(errs)
-            raise ValueError(msg)
+        check_entries(data, ">=", 0.0)
         return data
 
@@ -0,0 +1,166 @@
+import json
+import logging
+from datetime import datetime, timedelta
+
+from pydantic.json import isoformat, timedelta_isoformat
+
+logger = logging.getLogger(__name__)
+
+# Preference order used to pick the default backend at import time
+PREFERRED_BACKENDS = ["orjson", "ujson", "json"]
+
+
+def json_default(obj):
+    """Serialize the non-JSON types that appear in data models and schemas."""
+    if isinstance(obj, datetime):
+        return isoformat(obj)
+    if isinstance(obj, timedelta):
+        return timedelta_isoformat(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class JSONBackend:
+    """JSON codec used by load_data, save and schema_json.
+
+    dumps returns a str laid out like ``json.dumps(obj, indent=indent)``, or
+    with compact (and indent=None) without whitespace between tokens.
+    """
+
+    name = None
+
+    def loads(self, data):
+        raise NotImplementedError
+
+    def loads_buffer(self, data):
+        """Decode a bytes-like object such as a memoryview of an mmap.
+        Backends that cannot parse arbitrary buffers copy it to bytes first.
+        """
+        return self.loads(bytes(data))
+
+    def dumps(self, obj, indent=None, compact=False):
+        raise NotImplementedError
+
+    def supports_indent(self, indent, compact=False):
+        return True
+
+
+class StdlibBackend(JSONBackend):
+
+    name = "json"
+
+    def loads(self, data):
+        return json.loads(data)
+
+    def dumps(self, obj, indent=None, compact=False):
+        separators = (",", ":") if compact and indent is None else None
+        return json.dumps(obj, indent=indent, separators=separators, default=json_default)
+
+
+class OrjsonBackend(JSONBackend):
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+        self._orjson = orjson
+
+    def loads(self, data):
+        return self._orjson.loads(data)
+
+    def loads_buffer(self, data):
+        # orjson parses memoryviews in place
+        return self._orjson.loads(data)
+
+    def dumps(self, obj, indent=None, compact=False):
+        option = self._orjson.OPT_INDENT_2 if indent == 2 else 0
+        return self._orjson.dumps(obj, default=json_default, option=option).decode("utf-8")
+
+    def supports_indent(self, indent, compact=False):
+        return indent == 2 or (indent is None and compact)
+
+
+class UjsonBackend(JSONBackend):
+
+    name = "ujson"
+
+    def __init__(self):
+        import ujson
+        self._ujson = ujson
+
+    def loads(self, data):
+        return self._ujson.loads(data)
+
+    def dumps(self, obj, indent=None, compact=False):
+        return self._ujson.dumps(
+            obj, indent=indent or 0, escape_forward_slashes=False, default=json_default)
+
+    def supports_indent(self, indent, compact=False):
+        return indent is not None or compact
+
+
+_backend_classes = {
+    "json": StdlibBackend,
+    "orjson": OrjsonBackend,
+    "ujson": UjsonBackend,
+}
+_backends = {}
+
+
+def register_backend(backend):
+    """Make a JSONBackend instance available by name."""
+    _backends[backend.name] = backend
+
+
+def available_backends():
+    """Names of the backends that can be used in this environment."""
+    return list(_backends.keys())
+
+
+def get_backend(name=None):
+    """Return the backend called name, or the default backend if name is None."""
+    if name is None:
+        return _default
+    if isinstance(name, JSONBackend):
+        return name
+    if name not in _backends:
+        raise ValueError(f"JSON backend {name!r} is not available. Available: {available_backends()}")
+    return _backends[name]
+
+
+def set_default_backend(name):
+    """Change the backend used when none is requested explicitly."""
+    global _default
+    _default = get_backend(name)
+
+
+def loads(data, backend=None):
+    """Decode data (str or bytes) with the requested or default backend."""
+    return get_backend(backend).loads(data)
+
+
+def loads_buffer(data, backend=None):
+    """Decode a bytes-like object, without copying it if the backend allows."""
+    return get_backend(backend).loads_buffer(data)
+
+
+def dumps(obj, indent=None, backend=None, compact=False):
+    """Encode obj to a str with the requested or default backend.
+    With indent=None, the output has json.dumps' default separators unless
+    compact, which leaves out all whitespace. Falls back to the stdlib json
+    module if the backend cannot produce the requested layout.
+    """
+    codec = get_backend(backend)
+    if not codec.supports_indent(indent, compact):
+        logger.debug("JSON backend %s does not support indent=%s, compact=%s, using json", codec.name, indent,
+                     compact)
+        codec = _backends["json"]
+    return codec.dumps(obj, indent=indent, compact=compact)
+
+
+for _name, _cls in _backend_classes.items():
+    try:
+        register_backend(_cls())
+    except ImportError:
+        logger.debug("JSON backend %s is not installed", _name)
+
+_default = next(_backends[name] for name in PREFERRED_BACKENDS if name in _backends)
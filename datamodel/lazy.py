@@ -0,0 +1,101 @@
+import logging
+import threading
+
+from pydantic import ValidationError
+from pydantic.error_wrappers import ErrorWrapper
+from pydantic.errors import ExtraError, MissingError
+
+from datamodel.base import _loading
+
+logger = logging.getLogger(__name__)
+
+
+class LazyDataFile:
+    """Data file whose top-level sections are validated on first access.
+
+    Each section (e.g. ``network`` of an InputDataFile) is kept as raw data
+    until it is first accessed as an attribute. It is then validated, built
+    into its model class and cached, and its raw data is released. Model
+    level validators of the data file itself only run in materialize.
+
+    Parameters
+    ----------
+    model_cls : BidDSJsonBaseModel subclass
+        Class of the data file, e.g. InputDataFile
+    data : dict
+        Raw data as loaded from json
+    base_dir : str
+        Directory that resolve_path resolves relative paths against while
+        sections are validated
+    """
+
+    def __init__(self, model_cls, data, base_dir=None):
+        self._model_cls = model_cls
+        self._base_dir = base_dir
+        self._fields = {field.alias: field for field in model_cls.__fields__.values()}
+        unknown = set(data) - set(self._fields)
+        if unknown:
+            # extra sections would fail validation of the full model
+            raise ValidationError([ErrorWrapper(ExtraError(), loc=key) for key in sorted(unknown)], model_cls)
+        self._raw = dict(data)
+        self._sections = {}
+        self._lock = threading.Lock()
+
+    @property
+    def model_cls(self):
+        return self._model_cls
+
+    @property
+    def sections(self):
+        """Names of all top-level sections present in the file."""
+        return [key for key in self._fields if key in self._raw or key in self._sections]
+
+    @property
+    def materialized_sections(self):
+        """Names of the sections that have been validated and built so far."""
+        return [key for key in self._fields if key in self._sections]
+
+    def is_materialized(self, name):
+        return name in self._sections
+
+    def __getattr__(self, name):
+        # only called when normal attribute lookup fails, i.e. for sections
+        fields = self.__dict__.get("_fields")
+        if fields is None or name not in fields:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        return self.get_section(name)
+
+    def get_section(self, name):
+        """Return the named section, validating and building it on first use."""
+        try:
+            return self._sections[name]
+        except KeyError:
+            pass
+        with self._lock:
+            if name in self._sections:
+                return self._sections[name]
+            field = self._fields[name]
+            if name not in self._raw:
+                raise ValidationError([ErrorWrapper(MissingError(), loc=name)], self._model_cls)
+            with _loading(self._base_dir, self._model_cls.__name__):
+                value, error = field.validate(self._raw[name], {}, loc=name, cls=self._model_cls)
+            if error:
+                raise ValidationError([error], self._model_cls)
+            logger.debug("Materialized section %s of %s", name, self._model_cls.__name__)
+            self._sections[name] = value
+            del self._raw[name]
+            return value
+
+    def materialize(self):
+        """Validate all remaining sections and return the full data model."""
+        values = {}
+        errors = []
+        for name in self.sections:
+            try:
+                values[name] = self.get_section(name)
+            except ValidationError as e:
+                errors.extend(e.raw_errors)
+        if errors:
+            raise ValidationError(errors, self._model_cls)
+        with _loading(self._base_dir, self._model_cls.__name__):
+            return self._model_cls(**values)
@@ -0,0 +1,198 @@
+"""Validation levels selectable at load time.
+
+The levels are cumulative; each one runs the validators of the levels before it:
+
+schema
+    Types only. Numbers and lists of numbers are converted to their field
+    types as pydantic would, but their constraints (e.g. confloat bounds) are
+    not checked. No validator functions run.
+field
+    Per-field validators, e.g. Bus.vm_lb_gt_0 and the time series entry checks.
+object
+    Model level (root) validators that compare fields of one object, e.g.
+    Bus.vm_lb_le_init, including the rules checked in batch for a Network.
+cross
+    Checks across objects and sections, marked with cross_check: uid
+    uniqueness, references and time series alignment of an InputDataFile.
+full
+    All validators. This is the default and validates without hooks.
+
+Lower levels are for data known to satisfy the skipped checks, e.g. files
+written by the ingest service and read by a solver. Most of the time of a
+full validation is spent by pydantic on the entries of the time series, so
+only the schema level, which converts them without pydantic, is much faster.
+"""
+
+import contextlib
+import functools
+
+from pydantic import ConstrainedFloat, ConstrainedInt, ValidationError
+from pydantic.error_wrappers import ErrorWrapper
+from pydantic.errors import ExtraError, MissingError
+from pydantic.fields import SHAPE_LIST, SHAPE_SINGLETON, SHAPE_TUPLE
+
+from datamodel.base import submodel_field, validator_hook
+
+LEVELS = ("schema", "field", "object", "cross", "full")
+
+SCHEMA = "schema"
+OBJECT = "object"
+FULL = "full"
+
+
+def cross_check(func):
+    """Mark a root validator as a check across objects, run from the cross
+    level up. Apply below root_validator."""
+    func.__validation_level__ = "cross"
+    return func
+
+
+def check_level(level):
+    """Return the position of level in LEVELS, raising ValueError if unknown."""
+    try:
+        return LEVELS.index(level)
+    except ValueError:
+        raise ValueError(f"Unknown validation level {level!r}. Supported: {list(LEVELS)}") from None
+
+
+@contextlib.contextmanager
+def validation_level(level=FULL):
+    """Skip the validators above level for data models built within the context.
+    Parameters
+    ----------
+    level : str
+        One of LEVELS
+    """
+    position = check_level(level)
+    if level == FULL:
+        yield
+        return
+
+    def skip_above_level(info, cls, call):
+        if LEVELS.index(info.level) > position:
+            return call.value
+        return call()
+
+    with validator_hook(skip_above_level):
+        yield
+
+
+def build_schema(cls, data):
+    """Build a data model at the schema level.
+    Lists of numbers, such as the time series, are converted with the
+    builtin float and int in one pass each instead of validating every
+    entry with pydantic; other fields are validated by pydantic with all
+    validators skipped. Errors are reported as by pydantic.
+    Parameters
+    ----------
+    cls : BidDSJsonBaseModel subclass
+    data : dict
+    Returns
+    -------
+    cls instance
+    """
+    with validation_level(SCHEMA):
+        return _build_schema(cls, data)
+
+
+def _build_schema(cls, data):
+    values = {}
+    errors = []
+    names = set()
+    for name, field, submodel, convert in _schema_fields(cls):
+        names.add(field.alias)
+        names.add(name)
+        if field.alias in data:
+            value = data[field.alias]
+        elif name in data:
+            value = data[name]
+        else:
+            if field.required:
+                errors.append(ErrorWrapper(MissingError(), loc=field.alias))
+            continue
+
+        if value is not None and submodel is not None:
+            model, is_list = submodel
+            if not is_list:
+                values[name] = _build_nested(model, value, errors, field.alias)
+                continue
+            if type(value) is list:
+                values[name] = [_build_nested(model, item, errors, (field.alias, i)) for i, item in enumerate(value)]
+                continue
+        elif value is not None and convert is not None:
+            try:
+                values[name] = convert(value)
+                continue
+            except (TypeError, ValueError):
+                # let pydantic report the error
+                pass
+        value, field_errors = field.validate(value, values, loc=field.alias, cls=cls)
+        if isinstance(field_errors, ErrorWrapper):
+            errors.append(field_errors)
+        elif field_errors:
+            errors.extend(field_errors)
+        else:
+            values[name] = value
+
+    errors.extend(ErrorWrapper(ExtraError(), loc=key) for key in data if key not in names)
+    if errors:
+        raise ValidationError(errors, cls)
+    return cls.construct(**values)
+
+
+def _build_nested(model, value, errors, loc):
+    try:
+        if isinstance(value, dict):
+            return _build_schema(model, value)
+        return model.validate(value)
+    except (ValueError, TypeError, AssertionError) as e:
+        errors.append(ErrorWrapper(e, loc=loc))
+
+
+@functools.lru_cache(maxsize=None)
+def _schema_fields(cls):
+    """(name, field, submodel_field(field), converter) of the fields of cls."""
+    return [(name, field, submodel_field(field), _converter(field)) for name, field in cls.__fields__.items()]
+
+
+def _strict(type_):
+    def convert(value):
+        if type(value) is not type_:
+            raise TypeError(f"value is not a {type_.__name__}")
+        return value
+    return convert
+
+
+def _converter(field):
+    """Return a function that converts a json value of field to the field
+    type as pydantic does, ignoring constraints, and raises TypeError or
+    ValueError where pydantic would fail. None if the type has no such function."""
+    if field.shape == SHAPE_SINGLETON and not field.sub_fields:
+        type_ = field.type_
+        strict = getattr(type_, "strict", False)
+        if type_ is float or (isinstance(type_, type) and issubclass(type_, ConstrainedFloat)):
+            return _strict(float) if strict else float
+        if type_ is int or (isinstance(type_, type) and issubclass(type_, ConstrainedInt)):
+            return _strict(int) if strict else int
+        return None
+
+    items = [_converter(sub_field) for sub_field in field.sub_fields or ()]
+    if not items or None in items:
+        return None
+    if field.shape == SHAPE_LIST:
+        item = items[0]
+
+        def convert_list(value):
+            if type(value) is not list:
+                raise TypeError("value is not a list")
+            return list(map(item, value))
+        return convert_list
+    if field.shape == SHAPE_TUPLE:
+        n = len(items)
+
+        def convert_tuple(value):
+            if type(value) is not list or len(value) != n:
+                raise TypeError(f"value is not a list of {n} entries")
+            return tuple([convert(entry) for convert, entry in zip(items, value)])
+        return convert_tuple
+    return None
@@ -0,0 +1,216 @@
+"""Solutions written straight from the arrays of a solver.
+
+A solver holds its solution as dense (n, T) arrays per component type and
+field, e.g. p_on of the simple dispatchable devices. ArraySolution checks
+the arrays against the constraints of the output model fields in whole-array
+operations and writes the same json as OutputDataFile.save, without building
+a model object per component:
+
+    solution = OutputDataFile.from_arrays(
+        {"bus": bus_uids, ...},
+        {"bus": {"vm": vm, "va": va}, ...})
+    solution.save("solution.json")
+
+Float fields must be finite and within their bounds. Integer fields, e.g.
+on_status, take integer or boolean arrays, or float arrays of whole numbers,
+which are written as integers. Requires NumPy (the fast extra).
+"""
+
+import functools
+import math
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+from pydantic import ConstrainedFloat, ConstrainedInt
+from pydantic.fields import SHAPE_LIST
+
+from datamodel.atomic import atomic_write
+from datamodel.validation import BatchValidationError, RuleFailure
+from datamodel.vectorized import OPERATORS, entry_failures
+from datamodel.writer import round_array, write_model
+
+SECTION = "time_series_output"
+
+# Failing components (or entries) listed per field before the rest are left out
+MAX_FAILURES_PER_FIELD = 20
+
+
+class ArrayField:
+    """A time series field of an output model and its constraints"""
+
+    def __init__(self, name, field):
+        self.name = name
+        type_ = field.type_
+        self.is_int = type_ is int or (isinstance(type_, type) and issubclass(type_, ConstrainedInt))
+        if not self.is_int and not (type_ is float or (isinstance(type_, type) and issubclass(type_, ConstrainedFloat))):
+            raise TypeError(f"{name}: unsupported type {type_}")
+        # (op, bound) of the finite bounds
+        self.bounds = [(op, getattr(type_, attr)) for attr, op in (("gt", ">"), ("ge", ">="), ("lt", "<"), ("le", "<="))
+                       if getattr(type_, attr, None) is not None and math.isfinite(getattr(type_, attr))]
+
+
+@functools.lru_cache(maxsize=None)
+def array_fields(model):
+    """{component type: (model, [ArrayField])} of the lists of an output section model."""
+    fields = {}
+    for key, field in model.__fields__.items():
+        component = field.type_
+        if field.shape != SHAPE_LIST or "uid" not in component.__fields__:
+            raise TypeError(f"{model.__name__}.{key} is not a list of components")
+        fields[key] = (component, [ArrayField(name, sub_field) for name, sub_field in component.__fields__.items()
+                                   if name != "uid"])
+    return fields
+
+
+class ArraySolution:
+    """Checked solution arrays, written as an OutputDataFile"""
+
+    def __init__(self, model, uids_by_type, arrays_by_field):
+        """
+        Parameters
+        ----------
+        model : OutputDataFile subclass
+        uids_by_type : dict
+            {component type: list of n uids}, e.g. {"bus": ["bus_01", ...]}
+        arrays_by_field : dict
+            {component type: {field: array of shape (n, T)}}, for every time
+            series field of every component type
+        Raises
+        ------
+        BatchValidationError
+            With a RuleFailure per missing, unknown or malformed array and
+            per component with entries that fail a constraint
+        """
+        if np is None:
+            raise ImportError("Writing solutions from arrays requires numpy (pip install GO-3-data-model[fast])")
+        self.model = model
+        self.section = model.__fields__[SECTION].type_
+        self.uids = {}
+        self.arrays = {}
+        self.time_periods = None
+        failures = []
+        fields = array_fields(self.section)
+        for key in list(uids_by_type) + list(arrays_by_field):
+            if key not in fields:
+                failures.append(RuleFailure((SECTION, key), None, "value_error.extra", "extra fields not permitted"))
+        for key, (component, component_fields) in fields.items():
+            if key not in uids_by_type:
+                failures.append(RuleFailure((SECTION, key), None, "value_error.missing", "field required"))
+                continue
+            self.uids[key] = [str(uid) for uid in uids_by_type[key]]
+            self.arrays[key] = self._check_arrays(key, component_fields, arrays_by_field.get(key, {}), failures)
+        if failures:
+            raise BatchValidationError(failures)
+        if self.time_periods is None:
+            self.time_periods = 0
+
+    def _check_arrays(self, key, component_fields, given, failures):
+        uids = self.uids[key]
+        names = {field.name for field in component_fields}
+        for name in given:
+            if name not in names:
+                failures.append(RuleFailure((SECTION, key, name), None, "value_error.extra", "extra fields not permitted"))
+        arrays = {}
+        for field in component_fields:
+            loc = (SECTION, key, field.name)
+            if field.name not in given:
+                failures.append(RuleFailure(loc, None, "value_error.missing", "field required"))
+                continue
+            data = np.asarray(given[field.name])
+            if data.size == 0 and not uids:
+                data = data.reshape(0, self.time_periods or 0)
+            if data.ndim != 2 or data.shape[0] != len(uids) or (
+                    self.time_periods is not None and data.shape[1] != self.time_periods):
+                periods = "T" if self.time_periods is None else self.time_periods
+                failures.append(RuleFailure(loc, None, "value_error.shape",
+                                            f"fails shape ({len(uids)}, {periods}). shape: {data.shape}"))
+                continue
+            if uids and self.time_periods is None:
+                self.time_periods = data.shape[1]
+            data = self._convert(field, data, loc, failures)
+            if data is not None and self._check_entries(key, field, data, failures):
+                arrays[field.name] = data
+        return arrays
+
+    @staticmethod
+    def _convert(field, data, loc, failures):
+        kind = data.dtype.kind
+        if kind not in "biuf":
+            failures.append(RuleFailure(loc, None, "type_error.dtype", f"fails dtype numeric. dtype: {data.dtype}"))
+            return None
+        if not field.is_int:
+            return data.astype(float, copy=False)
+        if kind == "f":
+            whole = np.isfinite(data) & (data == np.round(data))
+            if not whole.all():
+                entries = [(i, j, data[i, j].item())
+                           for i, j in np.argwhere(~whole)[:MAX_FAILURES_PER_FIELD].tolist()]
+                failures.append(RuleFailure(loc, None, "type_error.integer",
+                                            f"value is not a valid integer. failures (i, index, entry): {entries}",
+                                            entries))
+                return None
+        return data.astype(np.int64, copy=False)
+
+    def _check_entries(self, key, field, data, failures):
+        """Add a RuleFailure for each component with entries that fail a
+        constraint of field. Returns whether all entries pass."""
+        checks = [(op, bound, OPERATORS[op][0](data, bound)) for op, bound in field.bounds]
+        if not field.is_int:
+            checks.insert(0, ("finite", None, ~np.isfinite(data)))
+        passed = True
+        for op, bound, fails in checks:
+            rows = np.flatnonzero(fails.any(axis=1))
+            if not len(rows):
+                continue
+            passed = False
+            rule = f"{field.name} {op}" if bound is None else f"{field.name} {op} {bound:g}"
+            for i in rows[:MAX_FAILURES_PER_FIELD].tolist():
+                if bound is None:
+                    idx = np.flatnonzero(fails[i])
+                    entries = list(zip(idx.tolist(), data[i, idx].tolist()))
+                else:
+                    entries = entry_failures(data[i], op, bound)
+                check = op if bound is None else f"{op} {bound:g}"
+                failures.append(RuleFailure((SECTION, key, i, field.name), self.uids[key][i], rule,
+                                            f"fails entries {check}. failures (index, entry): {entries}",
+                                            entries))
+        return passed
+
+    def _components(self, key, arrays):
+        """Yield the json object of each component of a type, one at a time."""
+        arrays = arrays[key]
+        for i, uid in enumerate(self.uids[key]):
+            component = {"uid": uid}
+            for name, data in arrays.items():
+                component[name] = data[i].tolist()
+            yield component
+
+    def save(self, filename, compact=False, decimals=None, checksum=False):
+        """Write the solution as OutputDataFile.save would.
+        Parameters
+        ----------
+        filename : str
+            Compressed with gzip, bz2 or xz if the name ends in .gz, .bz2 or .xz
+        compact : bool
+            If True, write the json without indentation or whitespace
+        decimals : int
+            If given, round the float arrays to this number of decimals first
+        checksum : bool
+            If True, also write the SHA-256 of the file to filename.sha256
+        """
+        arrays = self.arrays
+        if decimals is not None:
+            arrays = {key: {name: round_array(data, decimals) if data.dtype.kind == "f" else data
+                            for name, data in fields.items()}
+                      for key, fields in arrays.items()}
+        with atomic_write(filename, "wt", checksum=checksum) as f:
+            write_model({SECTION: {key: self._components(key, arrays) for key in self.uids}}, f,
+                        indent=None if compact else 4)
+
+    def to_model(self):
+        """Return the solution as an OutputDataFile, built without validation
+        (see BidDSJsonBaseModel.construct_tree)."""
+        data = {SECTION: {key: list(self._components(key, self.arrays)) for key in self.uids}}
+        return self.model.construct_tree(data)
@@ -1,5 +1,21 @@
 import logging
 from datamodel.output.database import *
 
-class OutputDataFile(OutputDataFileBase): pass
+class OutputDataFile(OutputDataFileBase):
 
+    @classmethod
+    def from_arrays(cls, uids_by_type, arrays_by_field):
+        """Check a solution given as arrays, to be written without building
+        the model objects (see datamodel.output.arrays).
+        Parameters
+        ----------
+        uids_by_type : dict
+            {component type: list of n uids}, e.g. {"bus": ["bus_01", ...]}
+        arrays_by_field : dict
+            {component type: {field: array of shape (n, T)}}
+        Returns
+        -------
+        ArraySolution
+        """
+        from datamodel.output.arrays import ArraySolution
+        return ArraySolution(cls, uids_by_type, arrays_by_field)
@@ -0,0 +1,172 @@
+import concurrent.futures
+import logging
+import contextlib
+import os
+
+from pydantic import ValidationError
+from pydantic.error_wrappers import ErrorWrapper
+
+from datamodel.base import submodel_fields
+from datamodel.levels import FULL, OBJECT, validation_level
+
+logger = logging.getLogger(__name__)
+
+# Lists shorter than this are validated in the calling process
+MIN_PARALLEL_ITEMS = 256
+
+
+def build_parallel(cls, data, workers=None, chunk_size=None, min_items=MIN_PARALLEL_ITEMS, level=FULL):
+    """Validate and build a data model, validating lists of components in a process pool.
+
+    Every list of models in the tree (e.g. network.simple_dispatchable_device)
+    with at least min_items records is split into chunks that are validated
+    independently in worker processes. The validated records are put back in
+    their original order and the rest of the model is then validated as
+    usual. If any record fails, the rest of the model is validated without
+    the checks across records (the cross level of datamodel.levels), which
+    would otherwise report missing references and positions that do not
+    match the data with the failed records left out (datamodel.report
+    handles that case for a full report). The errors are then reported with
+    the same locations as a serial load.
+
+    Parameters
+    ----------
+    cls : BidDSJsonBaseModel subclass
+    data : dict
+    workers : int
+        Number of worker processes. Defaults to os.cpu_count().
+    chunk_size : int
+        Records per task. Defaults to splitting each list in 4 tasks per worker.
+    min_items : int
+    level : str
+        Validation level of the records validated in the worker processes
+        (see datamodel.levels). The rest of the model is validated at the
+        level of the calling context.
+
+    Returns
+    -------
+    cls instance
+    """
+    workers = workers or os.cpu_count() or 1
+    lists = []
+    find_lists(cls, data, (), lists)
+    if not any(len(items) >= min_items for _, _, items in lists):
+        return cls(**data)
+
+    errors = []
+    model_types = {path: model for path, model, _ in lists}
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        tasks = []
+        for path, model, items in lists:
+            if len(items) < min_items:
+                tasks.append((path, 0, None, validate_items(model, items)))
+                continue
+            size = chunk_size or max(1, -(-len(items) // (workers * 4)))
+            for start in range(0, len(items), size):
+                future = executor.submit(validate_states, model, items[start:start + size], level)
+                tasks.append((path, start, future, None))
+
+        results = {}
+        for path, start, future, result in tasks:
+            if future is not None:
+                result = future.result()
+            validated = results.setdefault(path, [])
+            for offset, (value, error) in enumerate(result):
+                if error is not None:
+                    errors.append(ErrorWrapper(error, loc=path + (start + offset,)))
+                elif future is not None:
+                    validated.append(from_state(model_types[path], value))
+                else:
+                    validated.append(value)
+
+    # replace the raw lists with the validated records, copying only the
+    # containers on the way so that the caller's data is left untouched
+    data = replace_lists(cls, data, (), results)
+    if not errors:
+        return cls(**data)
+    try:
+        with validation_level(OBJECT):
+            cls(**data)
+    except ValidationError as e:
+        errors.extend(e.raw_errors)
+    raise ValidationError(errors, cls)
+
+
+def find_lists(cls, data, path, lists):
+    """Append (path, model class, raw items) for every list of models in data."""
+    if not isinstance(data, dict):
+        return
+    for key, (model, is_list) in submodel_fields(cls).items():
+        value = data.get(key)
+        if value is None:
+            continue
+        if is_list:
+            if isinstance(value, list):
+                lists.append((path + (key,), model, value))
+        else:
+            find_lists(model, value, path + (key,), lists)
+
+
+def replace_lists(cls, data, path, results):
+    """Return data with the lists at the paths in results replaced by the results."""
+    if not isinstance(data, dict):
+        return data
+    data = dict(data)
+    for key, (model, is_list) in submodel_fields(cls).items():
+        if key not in data:
+            continue
+        if is_list:
+            if path + (key,) in results:
+                data[key] = results[path + (key,)]
+        else:
+            data[key] = replace_lists(model, data[key], path + (key,), results)
+    return data
+
+
+def model_state(value, model):
+    """Return (field values, fields set) of a validated model, with the nested
+    models in the same form. Plain data pickles faster than model objects."""
+    values = dict(value.__dict__)
+    for key, (sub_model, is_list) in submodel_fields(model).items():
+        item = values.get(key)
+        if item is None:
+            continue
+        if is_list:
+            values[key] = [model_state(sub_item, sub_model) for sub_item in item]
+        else:
+            values[key] = model_state(item, sub_model)
+    return values, set(value.__fields_set__)
+
+
+def from_state(model, state):
+    """Rebuild a validated model from model_state, without validating it again."""
+    values, fields_set = state
+    for key, (sub_model, is_list) in submodel_fields(model).items():
+        item = values.get(key)
+        if item is None:
+            continue
+        if is_list:
+            values[key] = [from_state(sub_model, sub_item) for sub_item in item]
+        else:
+            values[key] = from_state(sub_model, item)
+    return model.construct(_fields_set=fields_set, **values)
+
+
+def validate_states(model, items, level=None):
+    """validate_items, returning the validated records as model_state for the
+    trip back from a worker process."""
+    return [(None if value is None else model_state(value, model), error)
+            for value, error in validate_items(model, items, level)]
+
+
+def validate_items(model, items, level=None):
+    """Validate each raw item as model. Returns a list of (instance, None) or (None, ValidationError).
+    If level is given, validate at that level (see datamodel.levels)."""
+    result = []
+    with validation_level(level) if level is not None else contextlib.nullcontext():
+        for item in items:
+            try:
+                result.append((model.parse_obj(item), None))
+            except ValidationError as e:
+                result.append((None, e))
+    return result
@@ -0,0 +1,137 @@
+"""Call counts and time spent per validator of the data models.
+
+Profiling is opt-in and uses a validator hook, so validation outside of
+profile_validators is not slowed down:
+
+    with profile_validators("validators.json") as profile:
+        InputDataFile.load(filename)
+    print(profile.format(top=20))
+
+The time of a validator is measured around its call, including the time of
+any hooks entered after the profile.
+"""
+
+import contextlib
+import json
+import time
+from pathlib import Path
+from typing import NamedTuple
+
+from datamodel.base import validator_hook
+
+
+class ValidatorStats(NamedTuple):
+    """Calls of one validator for one model class"""
+
+    model: str
+    """Module and class name, e.g. "static.Bus", as the input and output
+    models and the static and time series models share class names"""
+    validator: str
+    """Qualified name, e.g. "Bus.vm_lb_le_init" """
+    kind: str
+    """"field", "pre_root" or "root" """
+    calls: int
+    seconds: float
+
+    @property
+    def mean_us(self):
+        return 1e6 * self.seconds / self.calls if self.calls else 0.0
+
+
+class ValidatorProfile:
+    """Call counts and cumulative time per validator and model class"""
+
+    def __init__(self):
+        # (model class, validator info): [calls, seconds]
+        self._stats = {}
+
+    def hook(self, info, cls, call):
+        start = time.perf_counter()
+        try:
+            return call()
+        finally:
+            elapsed = time.perf_counter() - start
+            stats = self._stats.get((cls, info))
+            if stats is None:
+                self._stats[(cls, info)] = [1, elapsed]
+            else:
+                stats[0] += 1
+                stats[1] += elapsed
+
+    def clear(self):
+        self._stats.clear()
+
+    def records(self):
+        """Return the ValidatorStats of every validator that was called, by
+        decreasing total time."""
+        records = [ValidatorStats(_model_name(cls), info.name, info.kind, calls, seconds)
+                   for (cls, info), (calls, seconds) in self._stats.items()]
+        records.sort(key=lambda record: record.seconds, reverse=True)
+        return records
+
+    def by_model(self):
+        """Return {model class name: (calls, seconds)} over all its
+        validators, by decreasing total time."""
+        totals = {}
+        for record in self.records():
+            calls, seconds = totals.get(record.model, (0, 0.0))
+            totals[record.model] = (calls + record.calls, seconds + record.seconds)
+        return dict(sorted(totals.items(), key=lambda item: item[1][1], reverse=True))
+
+    def to_dict(self):
+        return {
+            "total_seconds": sum(record.seconds for record in self.records()),
+            "models": [{"model": model, "calls": calls, "seconds": seconds}
+                       for model, (calls, seconds) in self.by_model().items()],
+            "validators": [dict(record._asdict(), mean_us=record.mean_us) for record in self.records()],
+        }
+
+    def format(self, top=None):
+        """Return the report as text: the time per model class, then per
+        validator, limited to the top slowest if given."""
+        records = self.records()
+        total = sum(record.seconds for record in records)
+        lines = [f"{total:.3f} s in {sum(record.calls for record in records)} validator calls", "",
+                 f"{'seconds':>10} {'calls':>9}  model"]
+        for model, (calls, seconds) in self.by_model().items():
+            lines.append(f"{seconds:10.4f} {calls:9d}  {model}")
+        lines += ["", f"{'seconds':>10} {'calls':>9} {'mean us':>9}  validator (model)"]
+        for record in records[:top]:
+            lines.append(f"{record.seconds:10.4f} {record.calls:9d} {record.mean_us:9.2f}  "
+                         f"{record.validator} ({record.model})")
+        return "\n".join(lines)
+
+    def save(self, filename):
+        """Write the report to filename, as JSON if it ends with .json and
+        as text otherwise."""
+        filename = Path(filename)
+        with open(filename, "w") as f:
+            if filename.suffix == ".json":
+                json.dump(self.to_dict(), f, indent=4)
+            else:
+                f.write(self.format() + "\n")
+
+
+def _model_name(cls):
+    return f"{cls.__module__.rsplit('.', 1)[-1]}.{cls.__qualname__}"
+
+
+@contextlib.contextmanager
+def profile_validators(filename=None):
+    """Profile the validators run within the context.
+    Parameters
+    ----------
+    filename : str
+        If given, the report is saved to this file on exit, also when
+        validation fails (see ValidatorProfile.save)
+    Yields
+    ------
+    ValidatorProfile
+    """
+    profile = ValidatorProfile()
+    try:
+        with validator_hook(profile.hook):
+            yield profile
+    finally:
+        if filename is not None:
+            profile.save(filename)
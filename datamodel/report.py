@@ -0,0 +1,228 @@
+import logging
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from pydantic import ValidationError
+from pydantic.error_wrappers import ErrorWrapper, get_exc_type
+
+from datamodel.base import validator_hook
+from datamodel.parallel import find_lists, replace_lists, validate_items
+from datamodel.validation import BatchValidationError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_PER_RULE = 20
+DEFAULT_MAX_ERRORS = 1000
+
+_missing = object()
+
+
+class ValidationRecord(NamedTuple):
+    """One failed check of a validation report"""
+
+    path: Tuple
+    """Location in the data, e.g. ("network", "bus", 3, "vm_lb")"""
+    uid: Optional[str]
+    """uid of the innermost component containing the location, if any"""
+    rule: str
+    """Name of the validator (e.g. "Bus.vm_lb_le_init") or pydantic error type"""
+    message: str
+    values: Any = None
+    """The offending values, as far as they are known"""
+
+
+class ValidationReport(NamedTuple):
+    """Outcome of BidDSJsonBaseModel.validate_report"""
+
+    model: Any
+    """The validated data model, or None if any check failed"""
+    records: List[ValidationRecord]
+    """Failed checks, up to the caps"""
+    counts: Dict[str, int]
+    """Number of failures per rule, including those over the caps"""
+
+    @property
+    def valid(self):
+        return not self.counts
+
+    @property
+    def total(self):
+        return sum(self.counts.values())
+
+    @property
+    def truncated(self):
+        return len(self.records) < self.total
+
+    def format(self):
+        """Return the report as text, one line per record."""
+        if self.valid:
+            return "no errors"
+        lines = [f"{self.total} errors"]
+        for record in self.records:
+            path = ".".join(str(part) for part in record.path)
+            uid = f" (uid: {record.uid})" if record.uid is not None else ""
+            lines.append(f"{path}{uid} {record.rule}: {record.message}")
+        if self.truncated:
+            lines.append(f"{self.total - len(self.records)} more errors not listed. Counts per rule:")
+            lines.extend(f"  {rule}: {count}" for rule, count in sorted(self.counts.items()))
+        return "\n".join(lines)
+
+
+def build_report(cls, data, max_per_rule=DEFAULT_MAX_PER_RULE, max_errors=DEFAULT_MAX_ERRORS):
+    """Run all checks of a data model on raw data and collect every failure.
+
+    Every record of every list of components is validated on its own, so one
+    invalid record does not hide the errors of the others. The model is then
+    built from the valid records, which runs the model level and cross
+    reference checks on them. Cross reference failures that only involve
+    invalid records (e.g. a reference to a bus that failed validation) are
+    left out.
+
+    Parameters
+    ----------
+    cls : BidDSJsonBaseModel subclass
+    data : dict
+    max_per_rule : int
+        Maximum number of records kept per rule
+    max_errors : int
+        Maximum number of records kept in total
+
+    Returns
+    -------
+    ValidationReport
+    """
+    collector = _Collector(data, max_per_rule, max_errors)
+    with validator_hook(_tag_rule):
+        lists = []
+        find_lists(cls, data, (), lists)
+        results = {}
+        for path, model, items in lists:
+            validated = results.setdefault(path, [])
+            positions = collector.positions.setdefault(path, [])
+            for i, (value, error) in enumerate(validate_items(model, items)):
+                if error is not None:
+                    collector.add(error.raw_errors, path + (i,))
+                    if isinstance(items[i], dict):
+                        collector.invalid_uids.add(items[i].get("uid"))
+                else:
+                    validated.append(value)
+                    positions.append(i)
+
+        model = None
+        try:
+            model = cls(**replace_lists(cls, data, (), results))
+        except ValidationError as e:
+            collector.add(e.raw_errors, (), remap=True)
+    if collector.counts:
+        model = None
+    return ValidationReport(model, collector.records, collector.counts)
+
+
+def _tag_rule(info, cls, call):
+    try:
+        return call()
+    except (ValueError, TypeError, AssertionError) as e:
+        if not isinstance(e, BatchValidationError) and not hasattr(e, "rule"):
+            e.rule = info.name
+        raise
+
+
+def _lookup(data, path):
+    for key in path:
+        try:
+            data = data[key]
+        except (KeyError, IndexError, TypeError):
+            return _missing
+    return data
+
+
+class _Collector:
+
+    def __init__(self, data, max_per_rule, max_errors):
+        self.data = data
+        self.max_per_rule = max_per_rule
+        self.max_errors = max_errors
+        self.records = []
+        self.counts = {}
+        # original position of each valid record of the lists, by list path
+        self.positions = {}
+        # uids of the records that failed their own validation
+        self.invalid_uids = set()
+
+    def add(self, errors, loc, remap=False):
+        """Record the leaf errors. With remap, list indices in the locations
+        refer to the lists of valid records and are mapped back to the raw data."""
+        original = self._original if remap else tuple
+        for exc, path in _leaves(errors, loc):
+            if isinstance(exc, BatchValidationError):
+                base = path[:-1] if path[-1:] == ("__root__",) else path
+                for failure in exc.failures:
+                    if self._is_consequence(failure):
+                        continue
+                    self._record(ValidationRecord(
+                        original(base + failure.loc), failure.uid, failure.rule, failure.message,
+                        failure.values))
+                continue
+            if isinstance(exc.__cause__, BatchValidationError):
+                # a batch failure reported at the location of its object
+                failure = exc.__cause__.failures[0]
+                if not self._is_consequence(failure):
+                    base = path[:-1] if path[-1:] == ("__root__",) else path
+                    self._record(ValidationRecord(original(base), failure.uid, failure.rule, failure.message,
+                                                  failure.values))
+                continue
+            path = original(path)
+            rule = getattr(exc, "rule", None) or get_exc_type(type(exc))
+            self._record(ValidationRecord(path, self._uid(path), rule, str(exc), self._values(path)))
+
+    def _is_consequence(self, failure):
+        """Whether a failure only involves uids of records that failed their
+        own validation and were left out of the checks across records."""
+        if not isinstance(failure.values, dict) or not self.invalid_uids:
+            return False
+        uids = []
+        for value in failure.values.values():
+            uids.extend(value if isinstance(value, list) else [value])
+        return bool(uids) and all(isinstance(uid, str) and uid in self.invalid_uids for uid in uids)
+
+    def _record(self, record):
+        count = self.counts.get(record.rule, 0) + 1
+        self.counts[record.rule] = count
+        if count <= self.max_per_rule and len(self.records) < self.max_errors:
+            self.records.append(record)
+
+    def _original(self, path):
+        for list_path, positions in self.positions.items():
+            n = len(list_path)
+            if path[:n] == list_path and len(path) > n and isinstance(path[n], int):
+                return list_path + (positions[path[n]],) + path[n + 1:]
+        return path
+
+    def _uid(self, path):
+        for n in range(len(path), 0, -1):
+            value = _lookup(self.data, path[:n])
+            if isinstance(value, dict) and isinstance(value.get("uid"), str):
+                return value["uid"]
+        return None
+
+    def _values(self, path):
+        if path[-1:] == ("__root__",):
+            # a model level check: the scalar fields of the object
+            value = _lookup(self.data, path[:-1])
+            if isinstance(value, dict):
+                return {key: item for key, item in value.items() if isinstance(item, (str, int, float, bool))}
+            return None
+        value = _lookup(self.data, path)
+        return None if value is _missing else value
+
+
+def _leaves(errors, loc):
+    for error in errors:
+        if isinstance(error, ErrorWrapper):
+            exc = error.exc
+            path = loc + error.loc_tuple()
+            if isinstance(exc, ValidationError):
+                yield from _leaves(exc.raw_errors, path)
+            else:
+                yield exc, path
+        else:
+            yield from _leaves(error, loc)
@@ -0,0 +1,140 @@
+import logging
+
+from pydantic import ValidationError
+from pydantic.error_wrappers import ErrorWrapper
+from pydantic.errors import MissingError
+
+from datamodel.base import submodel_fields
+
+logger = logging.getLogger(__name__)
+
+
+def parse_include(include):
+    """Turn dotted paths into a nested dict, e.g.
+    {"network.bus", "reliability"} -> {"network": {"bus": True}, "reliability": True}
+    """
+    tree = {}
+    for path in include:
+        node = tree
+        parts = path.split(".")
+        for part in parts[:-1]:
+            child = node.setdefault(part, {})
+            if child is True:
+                # a parent path is already fully included
+                break
+            node = child
+        else:
+            node[parts[-1]] = True
+    return tree
+
+
+def build_selected(cls, data, include=None, uids=None):
+    """Build the requested parts of a data model from raw data.
+
+    Only the fields named in include are validated and built, and of the
+    lists of components only the records whose uid is requested. Fields that
+    are left out are not validated: lists of components are set to empty
+    lists and other fields to None, and none of them count as set, so that
+    save writes only the selected parts. Model level validators only run on
+    models that are included in full without a uid filter.
+
+    Parameters
+    ----------
+    cls : BidDSJsonBaseModel subclass
+    data : dict
+    include : collection of str
+        Dotted field paths, e.g. {"network.bus", "network.ac_line", "reliability"}.
+        Defaults to everything.
+    uids : collection of str, or dict of str to collection of str
+        uids of the records to keep in every included list, or a mapping from
+        a dotted path of a list (e.g. "network.bus") to the uids to keep there.
+        Defaults to all records.
+
+    Returns
+    -------
+    cls instance
+    """
+    tree = parse_include(include) if include is not None else True
+    if uids is not None and not isinstance(uids, dict):
+        uids = set(uids)
+    elif isinstance(uids, dict):
+        uids = {path: set(values) for path, values in uids.items()}
+    return _build(cls, data, tree, uids, ())
+
+
+def _uid_filter(uids, path):
+    if uids is None:
+        return None
+    if isinstance(uids, set):
+        return uids
+    return uids.get(".".join(path))
+
+
+def _is_filtered(cls, uids, path):
+    """Whether a uid filter applies to a list of models somewhere within cls."""
+    if uids is None:
+        return False
+    if isinstance(uids, dict):
+        prefix = ".".join(path)
+        return any(p == prefix or p.startswith(prefix + ".") for p in uids) if prefix else bool(uids)
+    for model, is_list in submodel_fields(cls).values():
+        if is_list or _is_filtered(model, uids, path):
+            return True
+    return False
+
+
+def _build(cls, data, node, uids, path):
+    if node is True and not _is_filtered(cls, uids, path):
+        return cls.parse_obj(data)
+
+    fields = {field.alias: field for field in cls.__fields__.values()}
+    submodels = submodel_fields(cls)
+    if node is True:
+        node = {key: True for key in fields}
+    unknown = set(node) - set(fields)
+    if unknown:
+        raise ValueError(f"{cls.__name__} has no fields {sorted(unknown)} "
+                         f"(included from {'.'.join(path) or 'top level'})")
+
+    values = {}
+    errors = []
+    for key, field in fields.items():
+        if key not in node:
+            values[key] = [] if submodels.get(key, (None, False))[1] else None
+            continue
+        if key not in data:
+            if field.required:
+                errors.append(ErrorWrapper(MissingError(), loc=key))
+            else:
+                values[key] = field.get_default()
+            continue
+        sub_path = path + (key,)
+        sub = submodels.get(key)
+        if sub is None:
+            value, error = field.validate(data[key], {}, loc=key, cls=cls)
+            if error:
+                errors.append(error)
+            values[key] = value
+            continue
+        model, is_list = sub
+        if not is_list:
+            try:
+                values[key] = _build(model, data[key], node[key], uids, sub_path)
+            except ValidationError as e:
+                errors.append(ErrorWrapper(e, loc=key))
+            continue
+        keep = _uid_filter(uids, sub_path)
+        # the uid filter of this list does not apply to its items
+        item_path = sub_path + ("[]",)
+        items = []
+        for i, item in enumerate(data[key]):
+            if keep is not None and isinstance(item, dict) and item.get("uid") not in keep:
+                continue
+            try:
+                items.append(_build(model, item, node[key], uids, item_path))
+            except ValidationError as e:
+                errors.append(ErrorWrapper(e, loc=(key, i)))
+        values[key] = items
+    if errors:
+        raise ValidationError(errors, cls)
+    return cls.construct(_fields_set={key for key in node if key in data}, **values)
@@ -0,0 +1,319 @@
+"""Sharded layout of a data file: one file per section and per component list.
+
+A data file is saved as a directory holding a json file for each top-level
+section, without its lists of components, and one for each list of
+components, e.g. for an InputDataFile:
+
+    case/
+        manifest.json
+        network.json                    general, violation_cost
+        network/bus.json
+        network/simple_dispatchable_device.json
+        ...
+        time_series_input.json
+        time_series_input/simple_dispatchable_device.json
+        reliability.json
+        reliability/contingency.json
+
+The manifest lists the shards with the dotted path of their data (as for
+load(include=...)), the number of components of the lists and the SHA-256
+and size of each file. It is written last, so a directory whose save was
+interrupted fails the checksums. The shards are independent json files that
+are read, checked and decoded in a thread pool, and written in one, which
+overlaps the file I/O, hashing and (de)compression. Validation runs once
+the data is assembled, as for a single file.
+
+load recognizes a sharded directory (or its manifest.json), and
+save(sharded=True) writes one. split_file and join_shards convert between
+the single-file and the sharded layouts without building the data model:
+
+    python datamodel/sharded.py split case.json case
+    python datamodel/sharded.py join case case.json
+"""
+
+import argparse
+import concurrent.futures
+import hashlib
+import logging
+from pathlib import Path
+
+from pydantic import BaseModel
+
+from datamodel import format_version, jsonbackends
+from datamodel.atomic import ChecksumError, atomic_write
+from datamodel.base import load_data, submodel_fields
+from datamodel.compression import CODECS, decompress
+from datamodel.writer import write_model
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = "manifest.json"
+FORMAT = "sharded"
+
+# Shard of the top-level fields that are not sections, if any
+ROOT_SHARD = "root"
+
+
+def is_sharded(filename):
+    """Whether filename is a sharded directory or its manifest."""
+    filename = Path(filename)
+    if filename.name == MANIFEST:
+        return filename.is_file()
+    return filename.is_dir() and (filename / MANIFEST).is_file()
+
+
+def shard_directory(filename):
+    """Return the directory of a sharded directory or of its manifest."""
+    filename = Path(filename)
+    return filename.parent if filename.name == MANIFEST else filename
+
+
+def _items(value):
+    """(name, value) of the set fields of a model, or the items of a dict."""
+    if isinstance(value, BaseModel):
+        return [(name, item) for name, item in value.__dict__.items() if name in value.__fields_set__]
+    return list(value.items())
+
+
+def split_shards(cls, data):
+    """Split a data model, or its decoded json, into shards.
+    Parameters
+    ----------
+    cls : BidDSJsonBaseModel subclass
+    data : cls instance or dict
+    Returns
+    -------
+    list of (path, value)
+        path is the dotted path of the data, e.g. "network" for the section
+        without its lists or "network.bus" for a list of components
+    """
+    sections = submodel_fields(cls)
+    root = {}
+    shards = []
+    for key, value in _items(data):
+        if key not in sections or sections[key][1] or value is None:
+            root[key] = value
+            continue
+        lists = {name for name, (_, is_list) in submodel_fields(sections[key][0]).items() if is_list}
+        section = {}
+        components = []
+        for name, item in _items(value):
+            if name in lists and item is not None:
+                components.append((f"{key}.{name}", item))
+            else:
+                section[name] = item
+        shards.append((key, section))
+        shards.extend(components)
+    if root:
+        shards.insert(0, (ROOT_SHARD, root))
+    return shards
+
+
+def shard_file(path, compression=None):
+    """Return the name of the file of a shard relative to the directory,
+    e.g. "network/bus.json"."""
+    suffix = ".json" if compression is None else ".json" + CODECS[compression][0][0]
+    return "/".join(path.split(".")) + suffix
+
+
+def read_manifest(filename):
+    directory = shard_directory(filename)
+    manifest = load_data(directory / MANIFEST)
+    if manifest.get("format") != FORMAT:
+        raise ValueError(f"{directory / MANIFEST} is not a manifest of a sharded data file")
+    return manifest
+
+
+def _write_shard(directory, path, value, compression, indent, decimals):
+    name = shard_file(path, compression)
+    filename = directory / name
+    filename.parent.mkdir(parents=True, exist_ok=True)
+    with atomic_write(filename, "wt", compression=compression) as f:
+        write_model(value, f, indent=indent, decimals=decimals)
+    entry = {"path": path, "file": name}
+    if isinstance(value, list):
+        entry["count"] = len(value)
+    entry["sha256"] = f.sha256
+    entry["size"] = filename.stat().st_size
+    return entry
+
+
+def save_sharded(cls, data, directory, compact=False, decimals=None, compression=None, workers=None,
+                 checksum=False):
+    """Write a data model, or its decoded json, as a sharded directory.
+    Shards of a previous save that are not part of the new one are removed.
+    Parameters
+    ----------
+    cls : BidDSJsonBaseModel subclass
+    data : cls instance or dict
+    directory : str
+        Created if needed
+    compact : bool
+        If True, write the json without indentation or whitespace
+    decimals : int
+        If given, round floats to this number of decimals (see save)
+    compression : str
+        None, or one of the CODECS names to compress every shard with
+    workers : int
+        Number of threads writing shards. Defaults to the executor's default.
+    checksum : bool
+        If True, also write a checksum sidecar of the manifest (see datamodel.atomic)
+    Returns
+    -------
+    dict
+        The manifest
+    """
+    if compression is not None and compression not in CODECS:
+        raise ValueError(f"Unsupported compression {compression!r}. Supported: {list(CODECS)}")
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    try:
+        previous = {shard["file"] for shard in read_manifest(directory)["shards"]}
+    except (FileNotFoundError, ValueError, KeyError, TypeError):
+        previous = set()
+
+    indent = None if compact else 4
+    shards = split_shards(cls, data)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_write_shard, directory, path, value, compression, indent, decimals)
+                   for path, value in shards]
+        entries = [future.result() for future in futures]
+
+    manifest = {"format": FORMAT, "model": cls.__name__, "format_version": format_version, "shards": entries}
+    with atomic_write(directory / MANIFEST, "wt", compression=None, checksum=checksum) as f:
+        write_model(manifest, f, indent=4)
+    for name in previous - {entry["file"] for entry in entries}:
+        try:
+            (directory / name).unlink()
+        except FileNotFoundError:
+            pass
+    logger.debug("Saved %d shards to %s", len(entries), directory)
+    return manifest
+
+
+def _read_shard(directory, entry, backend, verify):
+    filename = directory / entry["file"]
+    with open(filename, "rb") as f:
+        raw = f.read()
+    if verify and "sha256" in entry:
+        actual = hashlib.sha256(raw).hexdigest()
+        if actual != entry["sha256"]:
+            raise ChecksumError(f"{filename} fails checksum. sha256: {actual}, expected: {entry['sha256']}")
+    value = jsonbackends.loads(decompress(raw), backend=backend)
+    if verify and "count" in entry and (not isinstance(value, list) or len(value) != entry["count"]):
+        count = len(value) if isinstance(value, list) else None
+        raise ValueError(f"{filename} fails count == {entry['count']}. count: {count}")
+    return value
+
+
+def read_sharded(filename, backend=None, workers=None, verify=True):
+    """Read the shards of a sharded directory in parallel and assemble the
+    decoded json of the whole data file.
+    Parameters
+    ----------
+    filename : str
+        The directory or its manifest
+    backend : str
+        Name of the JSON backend used to decode the shards
+    workers : int
+        Number of threads reading shards. Defaults to the executor's default.
+    verify : bool
+        If True, check the SHA-256 and component counts of the shards
+        against the manifest
+    Returns
+    -------
+    dict
+    Raises
+    ------
+    datamodel.atomic.ChecksumError
+        If a shard does not match its checksum
+    """
+    directory = shard_directory(filename)
+    entries = read_manifest(directory)["shards"]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_read_shard, directory, entry, backend, verify) for entry in entries]
+        values = [future.result() for future in futures]
+
+    data = {}
+    for entry, value in zip(entries, values):
+        path = entry["path"]
+        if path == ROOT_SHARD:
+            data.update(value)
+        elif "." in path:
+            section, name = path.split(".", 1)
+            data.setdefault(section, {})[name] = value
+        else:
+            data.setdefault(path, {}).update(value)
+    logger.debug("Read %d shards from %s", len(entries), directory)
+    return data
+
+
+def split_file(cls, filename, directory, backend=None, **kwargs):
+    """Convert a data file to the sharded layout, without validating it.
+    Parameters
+    ----------
+    cls : BidDSJsonBaseModel subclass
+        Model of the file, which defines its sections and lists
+    filename : str
+    directory : str
+    backend : str
+        Name of the JSON backend used to decode the file
+    kwargs : passed to save_sharded
+    Returns
+    -------
+    dict
+        The manifest
+    """
+    return save_sharded(cls, load_data(filename, backend=backend), directory, **kwargs)
+
+
+def join_shards(directory, filename, compact=False, decimals=None, checksum=False, backend=None, workers=None,
+                verify=True):
+    """Convert a sharded directory to a single data file, without validating it.
+    Parameters
+    ----------
+    directory : str
+    filename : str
+        Compressed with gzip, bz2 or xz if the name ends in .gz, .bz2 or .xz
+    compact, decimals, checksum :
+        As for save
+    backend, workers, verify :
+        As for read_sharded
+    """
+    data = read_sharded(directory, backend=backend, workers=workers, verify=verify)
+    with atomic_write(filename, "wt", checksum=checksum) as f:
+        write_model(data, f, indent=None if compact else 4, decimals=decimals)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert between single-file and sharded data files")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    split_parser = subparsers.add_parser("split", help="Single file to sharded directory")
+    split_parser.add_argument("filename")
+    split_parser.add_argument("directory")
+    split_parser.add_argument("--model", choices=["input", "output"], default="input")
+    split_parser.add_argument("--compact", action="store_true")
+    split_parser.add_argument("--compression", choices=list(CODECS))
+    split_parser.add_argument("--workers", type=int)
+
+    join_parser = subparsers.add_parser("join", help="Sharded directory to single file")
+    join_parser.add_argument("directory")
+    join_parser.add_argument("filename")
+    join_parser.add_argument("--compact", action="store_true")
+    join_parser.add_argument("--workers", type=int)
+
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    if args.command == "split":
+        if args.model == "input":
+            from datamodel.input.data import InputDataFile as model
+        else:
+            from datamodel.output.data import OutputDataFile as model
+        manifest = split_file(model, args.filename, args.directory, compact=args.compact,
+                              compression=args.compression, workers=args.workers)
+        print(f"{len(manifest['shards'])} shards in {args.directory}")
+    elif args.command == "join":
+        join_shards(args.directory, args.filename, compact=args.compact, workers=args.workers)
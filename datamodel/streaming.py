@@ -0,0 +1,227 @@
+import json
+import logging
+
+from pydantic import ValidationError
+from pydantic.error_wrappers import ErrorWrapper
+
+from datamodel.base import submodel_fields
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+WHITESPACE = " \t\n\r"
+
+# Levels of objects and arrays walked by read_data: the data file, its
+# sections, their lists and the elements of the lists
+WALK_DEPTH = 3
+
+
+class JSONStreamReader:
+    """Incremental reader over a text stream holding a single JSON document.
+
+    Only the part of the document that is currently being decoded is kept in
+    memory. Objects can be walked key by key and arrays element by element,
+    while any other value is decoded in one piece with the stdlib decoder.
+
+    Parameters
+    ----------
+    stream : text file-like object
+    chunk_size : int
+        Number of characters requested from the stream per read
+    """
+
+    def __init__(self, stream, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, size=None):
+        """Append at least one more chunk to the buffer. Returns False at EOF."""
+        if self.eof:
+            return False
+        if self.pos > self.chunk_size:
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+        chunk = self.stream.read(size or self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer += chunk
+        return True
+
+    def peek(self):
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                raise ValueError("Unexpected end of JSON document")
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} at offset {self.pos}, found {found!r}")
+        self.pos += 1
+
+    def read_value(self):
+        """Decode and consume the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # the value may straddle the end of the buffer; grow the read
+                # size with the value so that large values are not rescanned
+                # once per chunk
+                if not self._fill(max(self.chunk_size, len(self.buffer) - self.pos)):
+                    raise
+                continue
+            # a number close to the end of the buffer may continue in the next
+            # chunk (e.g. "1.5e" followed by "-05")
+            is_number = isinstance(value, (int, float)) and not isinstance(value, bool)
+            if is_number and end + 2 >= len(self.buffer) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def iter_object_keys(self):
+        """Walk an object, yielding each key with the reader positioned at its value.
+
+        The caller must consume the value (with ``read_value`` or one of the
+        ``iter_*`` methods) before requesting the next key.
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            if self.peek() != '"':
+                raise ValueError(f"Expected object key at offset {self.pos}")
+            key = self.read_value()
+            self.expect(":")
+            yield key
+            if self.peek() == ",":
+                self.pos += 1
+                continue
+            self.expect("}")
+            return
+
+    def iter_array(self):
+        """Walk an array, yielding each decoded element in turn."""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.read_value()
+            if self.peek() == ",":
+                self.pos += 1
+                continue
+            self.expect("]")
+            return
+
+
+def read_data(stream, chunk_size=DEFAULT_CHUNK_SIZE, depth=WALK_DEPTH):
+    """Decode a JSON text stream into plain data, holding only part of the text.
+
+    Objects and arrays are walked down to depth levels of nesting, e.g. to
+    the elements of the lists of components for the default, and every value
+    below is decoded in one piece. Only the text of the value being decoded
+    is buffered, so unlike reading the whole stream and decoding it, the
+    full text is never held in memory next to the decoded data.
+
+    Parameters
+    ----------
+    stream : text file-like object
+    chunk_size : int
+    depth : int
+
+    Returns
+    -------
+    dict or list
+    """
+    reader = JSONStreamReader(stream, chunk_size=chunk_size)
+    data = _read_tree(reader, depth)
+    while True:
+        while reader.pos < len(reader.buffer) and reader.buffer[reader.pos] in WHITESPACE:
+            reader.pos += 1
+        if reader.pos < len(reader.buffer):
+            raise ValueError(f"Extra data at offset {reader.pos}")
+        if not reader._fill():
+            return data
+
+
+def _read_tree(reader, depth):
+    char = reader.peek()
+    if depth <= 0 or char not in "{[":
+        return reader.read_value()
+    if char == "{":
+        return {key: _read_tree(reader, depth - 1) for key in reader.iter_object_keys()}
+    items = []
+    reader.expect("[")
+    if reader.peek() == "]":
+        reader.pos += 1
+        return items
+    while True:
+        items.append(_read_tree(reader, depth - 1))
+        if reader.peek() == ",":
+            reader.pos += 1
+            continue
+        reader.expect("]")
+        return items
+
+
+def load_model_streaming(cls, stream, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Build a data model from a JSON text stream, one component at a time.
+
+    Nested models are walked key by key. Each element of a list of models is
+    decoded, validated and built before the next one is read, so the raw
+    dictionary for an element is released as soon as its model exists and
+    the full raw tree is never held in memory.
+
+    Parameters
+    ----------
+    cls : BidDSJsonBaseModel subclass
+    stream : text file-like object
+    chunk_size : int
+
+    Returns
+    -------
+    cls instance
+    """
+    reader = JSONStreamReader(stream, chunk_size=chunk_size)
+    return _read_model(cls, reader)
+
+
+def _read_model(cls, reader):
+    submodels = submodel_fields(cls)
+    values = {}
+    errors = []
+    for key in reader.iter_object_keys():
+        sub = submodels.get(key)
+        if sub is None:
+            values[key] = reader.read_value()
+            continue
+        model, is_list = sub
+        if not is_list:
+            try:
+                values[key] = _read_model(model, reader)
+            except ValidationError as e:
+                errors.append(ErrorWrapper(e, loc=key))
+            continue
+        items = []
+        for i, raw in enumerate(reader.iter_array()):
+            try:
+                items.append(model.parse_obj(raw))
+            except ValidationError as e:
+                errors.append(ErrorWrapper(e, loc=(key, i)))
+            del raw
+        values[key] = items
+    if errors:
+        raise ValidationError(errors, cls)
+    return cls(**values)
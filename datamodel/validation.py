@@ -0,0 +1,187 @@
+"""Batch evaluation of per-object validators.
+
+Model level (root) validators that compare fields of a single object, such as
+Bus.vm_lb_le_init, are declared as usual and marked with batchable. When the
+objects are built as part of a containing model that checks them in batch
+(e.g. the components of a Network), validation of the marked rules is
+deferred and the container evaluates each rule for all objects of a list at
+once with check_batch, then reports each failure at the location of its
+object with expand_batch_errors. Objects built on their own are validated
+per object as before.
+"""
+
+import contextlib
+import contextvars
+import functools
+import logging
+import operator
+from typing import Any, NamedTuple, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+from pydantic.error_wrappers import ErrorWrapper
+from pydantic.utils import ROOT_KEY
+
+logger = logging.getLogger(__name__)
+
+_deferred = contextvars.ContextVar("deferred_validation", default=False)
+
+
+@contextlib.contextmanager
+def deferred_validation():
+    """Skip batchable validators within the context."""
+    token = _deferred.set(True)
+    try:
+        yield
+    finally:
+        _deferred.reset(token)
+
+
+def is_deferred():
+    """Whether batchable validators are skipped in the current context."""
+    return _deferred.get()
+
+
+def batchable(func):
+    """Mark a root validator as one that a containing model checks in batch.
+    Apply below root_validator. While validation is deferred, the validator
+    passes the values through unchanged.
+    """
+
+    @functools.wraps(func)
+    def wrapper(cls, values):
+        if _deferred.get():
+            return values
+        return func(cls, values)
+
+    return wrapper
+
+
+class BatchRule(NamedTuple):
+    """A per-object rule evaluated over columns of a list of objects.
+
+    name is the name of the batchable root validator on the model class. It
+    is used to produce the error message of each failing object, so messages
+    are the same as when the object is validated on its own. columns are
+    (possibly dotted) attribute names, and fails maps the columns as NumPy
+    arrays to a boolean array that is True for candidate failures.
+    """
+
+    name: str
+    columns: Tuple[str, ...]
+    fails: Any
+
+
+class RuleFailure(NamedTuple):
+    """An object that fails a batch rule"""
+
+    loc: Tuple
+    uid: Any
+    rule: str
+    message: str
+    values: Any = None
+
+
+class BatchValidationError(ValueError):
+    """Consolidated report of the objects failing batch rules."""
+
+    code = "batch"
+
+    def __init__(self, failures):
+        super().__init__(failures)
+
+    @property
+    def failures(self):
+        return self.args[0]
+
+    def __str__(self):
+        lines = [f"fails {len(self.failures)} checks:"]
+        for failure in self.failures:
+            loc = ".".join(str(part) for part in failure.loc)
+            lines.append(f"  {loc} (uid: {failure.uid}) {failure.rule}: {failure.message}")
+        return "\n".join(lines)
+
+
+def expand_batch_errors(errors):
+    """Return pydantic errors with each BatchValidationError raised by a root
+    validator replaced by one error per failure at the location of the
+    object, e.g. ("bus", 3, "__root__"), as if the objects had been validated
+    one by one. The errors keep the name of the rule in their rule attribute
+    and a BatchValidationError of the failure as their cause (see
+    datamodel.report)."""
+    expanded = []
+    for error in flatten_errors(errors):
+        if isinstance(error.exc, BatchValidationError) and error.loc_tuple() == (ROOT_KEY,):
+            for failure in error.exc.failures:
+                exc = ValueError(failure.message)
+                exc.rule = failure.rule
+                exc.__cause__ = BatchValidationError([failure])
+                expanded.append(ErrorWrapper(exc, loc=failure.loc + (ROOT_KEY,)))
+        else:
+            expanded.append(error)
+    return expanded
+
+
+def flatten_errors(errors):
+    """Return the ErrorWrappers of pydantic's possibly nested raw errors."""
+    flat = []
+    for error in errors:
+        if isinstance(error, ErrorWrapper):
+            flat.append(error)
+        else:
+            flat.extend(flatten_errors(error))
+    return flat
+
+
+def _column(items, name):
+    get = operator.attrgetter(name)
+    if isinstance(get(items[0]), str):
+        return np.array([get(item) for item in items], dtype=object)
+    return np.fromiter(map(get, items), dtype=float, count=len(items))
+
+
+def _rule_function(model, name):
+    func = getattr(model, name).__func__
+    return getattr(func, "__wrapped__", func)
+
+
+def check_batch(model, items, rules, loc=()):
+    """Evaluate rules for all items of a list of models.
+    Parameters
+    ----------
+    model : BidDSJsonBaseModel subclass
+        Class of the items
+    items : list of model instances
+    rules : list of BatchRule
+    loc : tuple
+        Location of the list, prefixed to the location of each failure
+    Returns
+    -------
+    list of RuleFailure
+    """
+    failures = []
+    if not items:
+        return failures
+    columns = {}
+    for rule in rules:
+        func = _rule_function(model, rule.name)
+        if np is not None:
+            for name in rule.columns:
+                if name not in columns:
+                    columns[name] = _column(items, name)
+            fails = rule.fails(*(columns[name] for name in rule.columns))
+            candidates = np.flatnonzero(fails).tolist()
+        else:
+            candidates = range(len(items))
+        for i in candidates:
+            item = items[i]
+            try:
+                # confirm with the rule itself, which also gives the message
+                func(model, dict(item.__dict__))
+            except ValueError as e:
+                values = {name: operator.attrgetter(name)(item) for name in rule.columns}
+                failures.append(RuleFailure(loc + (i,), getattr(item, "uid", None), func.__qualname__, str(e), values))
+    failures.sort(key=lambda failure: failure.loc)
+    return failures
@@ -0,0 +1,94 @@
+"""Whole-array checks of time series entries for use in validators.
+
+Each check makes one pass over a field in C to decide whether any entry
+fails, and only locates the failing entries when there are some. The
+validators receive lists from pydantic, which are checked with the builtin
+min/max: converting them to NumPy arrays first takes about twice as long as
+the whole check, for lists of any length. entry_failures also compares NumPy
+arrays as arrays, for callers that hold them (see datamodel.output.arrays).
+Entries are expected to be finite, as guaranteed by the confloat field
+types, which are validated before the validators run.
+
+The error messages are the same as those of the equivalent element by
+element checks, e.g. "fails entries >= 0. failures (index, entry): [(3, -1.0)]".
+"""
+
+import itertools
+import operator
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# op: (predicate that an entry fails, reduction whose value fails iff any entry fails)
+OPERATORS = {
+    ">=": (operator.lt, min),
+    ">": (operator.le, min),
+    "<=": (operator.gt, max),
+    "<": (operator.ge, max),
+}
+
+
+def _operator(op):
+    try:
+        return OPERATORS[op]
+    except KeyError:
+        raise ValueError(f"Unsupported operator {op!r}. Supported: {list(OPERATORS)}") from None
+
+
+def _is_array(data):
+    return np is not None and isinstance(data, np.ndarray)
+
+
+def entry_failures(data, op, bound):
+    """Return [(index, entry)] for the entries of data that fail `entry op bound`.
+    Parameters
+    ----------
+    data : list of float or 1-d numpy array
+    op : str
+        One of ">=", ">", "<=", "<"
+    bound : float
+    """
+    fails, reduce = _operator(op)
+    if _is_array(data):
+        idx = np.flatnonzero(fails(data, bound))
+        return list(zip(idx.tolist(), data[idx].tolist()))
+    if not data or not fails(reduce(data), bound):
+        return []
+    return [(i, entry) for i, entry in enumerate(data) if fails(entry, bound)]
+
+
+def nested_entry_failures(data, position, op, bound):
+    """Return [(i, j, entry)] where data[i][j][position] fails `entry op bound`.
+    Parameters
+    ----------
+    data : list of list of tuple
+        e.g. a time series of cost functions made of cost blocks
+    position : int
+    op : str
+    bound : float
+    """
+    fails, reduce = _operator(op)
+    get = operator.itemgetter(position)
+    extreme = reduce(map(get, itertools.chain.from_iterable(data)), default=None)
+    if extreme is None or not fails(extreme, bound):
+        return []
+    return [(i, j, data[i][j][position]) for i in range(len(data)) for j in range(len(data[i]))
+            if fails(data[i][j][position], bound)]
+
+
+def check_entries(data, op, bound):
+    """Raise ValueError if any entry of data fails `entry op bound`."""
+    errs = entry_failures(data, op, bound)
+    if len(errs) > 0:
+        msg = "fails entries {} {:g}. failures (index, entry): {}".format(op, bound, errs)
+        raise ValueError(msg)
+
+
+def check_nested_entries(data, position, op, bound):
+    """Raise ValueError if any data[i][j][position] fails `entry op bound`."""
+    errs = nested_entry_failures(data, position, op, bound)
+    if len(errs) > 0:
+        msg = "fails entries[i][j][{}] {} {:g}. failures (i, j, entry): {}".format(position, op, bound, errs)
+        raise ValueError(msg)
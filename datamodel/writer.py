@@ -0,0 +1,257 @@
+"""Streaming JSON writer for data models.
+
+write_model walks a data model once and writes its json to a text stream in
+chunks, without first building the dict of the whole model. The output is
+the same as json.dumps of model.dict(exclude_unset=True) with the booleans
+converted to 0/1, which is what save wrote before: with indent, laid out as
+json.dumps(obj, indent=indent), and otherwise compact with no whitespace.
+
+Lists of numbers, such as the time series, are formatted in one join each,
+and nested lists of numbers together. Iterators are written as lists, item
+by item, so that large lists can be generated while they are written.
+With decimals, lists of floats are rounded in bulk with NumPy, to the same
+values as the builtin round, which also makes the shorter numbers faster to
+format.
+"""
+
+import json
+from collections.abc import Iterator
+from json.encoder import encode_basestring_ascii
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+from pydantic import BaseModel
+
+from datamodel.jsonbackends import json_default
+
+# Number of pieces of text buffered before they are written
+CHUNK_PARTS = 4096
+
+# Lists of floats at least this long are rounded with NumPy
+MIN_ARRAY_LENGTH = 8
+
+_NUMBER_TYPES = {float, int}
+
+_END = object()
+
+
+def write_model(model, stream, indent=None, decimals=None):
+    """Write a data model as json.
+    Parameters
+    ----------
+    model : BidDSJsonBaseModel
+        Only the fields that were set are written, as with exclude_unset
+    stream : text file object
+    indent : int
+        Spaces per level, or None for compact output
+    decimals : int
+        If given, round floats to this number of decimals
+    """
+    writer = _Writer(stream, indent, decimals)
+    writer.value(model, 0)
+    writer.flush()
+
+
+def round_values(values, decimals):
+    """Round a list of floats to decimals as the builtin round does, in bulk
+    with NumPy for longer lists (see round_array)."""
+    if np is not None and len(values) >= MIN_ARRAY_LENGTH:
+        return round_array(np.array(values, dtype=float), decimals).tolist()
+    return [round(value, decimals) for value in values]
+
+
+def round_array(data, decimals):
+    """Round a float array to decimals, with the same results as the builtin
+    round on each entry.
+    np.round scales the values by 10**decimals, which is exact, and rounds
+    them half to even. Rounding the product can move a value across the
+    halfway point, e.g. 2.675 (stored as 2.67499...) to 267.5, so the
+    entries whose scaled value is close to halfway are rounded again with
+    the builtin round."""
+    if decimals < 0:
+        # 10**decimals is not exact
+        return np.array([round(value, decimals) for value in data.ravel().tolist()]).reshape(data.shape)
+    with np.errstate(over="ignore", invalid="ignore"):
+        scaled = data * 10.0 ** decimals
+        # values too large to scale are whole numbers already
+        result = np.where(np.isfinite(scaled), np.round(scaled) / 10.0 ** decimals, data)
+        near = np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) <= np.abs(scaled) * 1e-12
+    for i in np.flatnonzero(near).tolist():
+        result.flat[i] = round(data.flat[i].item(), decimals)
+    return result
+
+
+def _flatten(values, flat):
+    """Append the numbers in nested lists values to flat. Returns False if
+    there is anything else."""
+    for value in values:
+        type_ = type(value)
+        if type_ is float or type_ is int:
+            flat.append(value)
+        elif type_ is list or type_ is tuple:
+            if not _flatten(value, flat):
+                return False
+        else:
+            return False
+    return True
+
+
+def _float_text(value):
+    # as json.dumps
+    if value != value:
+        return "NaN"
+    if value == float("inf"):
+        return "Infinity"
+    if value == -float("inf"):
+        return "-Infinity"
+    return float.__repr__(value)
+
+
+class _Writer:
+
+    def __init__(self, stream, indent, decimals):
+        self.write = stream.write
+        self.parts = []
+        self.indent = indent
+        self.decimals = decimals
+        self.key_separator = ":" if indent is None else ": "
+        # newline and indentation of each level
+        self.newlines = []
+
+    def newline(self, level):
+        if self.indent is None:
+            return ""
+        while len(self.newlines) <= level:
+            self.newlines.append("\n" + " " * (self.indent * len(self.newlines)))
+        return self.newlines[level]
+
+    def flush(self):
+        self.write("".join(self.parts))
+        self.parts.clear()
+
+    def value(self, value, level):
+        type_ = type(value)
+        if type_ is str:
+            self.parts.append(encode_basestring_ascii(value))
+        elif type_ is float:
+            if self.decimals is not None:
+                value = round(value, self.decimals)
+            self.parts.append(_float_text(value))
+        elif type_ is int:
+            self.parts.append(int.__repr__(value))
+        elif type_ is bool:
+            self.parts.append("1" if value else "0")
+        elif value is None:
+            self.parts.append("null")
+        elif type_ is list or type_ is tuple:
+            self.array(value, level)
+        elif isinstance(value, BaseModel):
+            self.object([(name, item) for name, item in value.__dict__.items() if name in value.__fields_set__],
+                        level)
+        elif isinstance(value, dict):
+            self.object(list(value.items()), level)
+        elif isinstance(value, str):
+            self.parts.append(encode_basestring_ascii(value))
+        elif isinstance(value, int):
+            self.parts.append(int.__repr__(value))
+        elif isinstance(value, float):
+            self.value(float(value), level)
+        elif isinstance(value, (list, tuple)):
+            self.array(value, level)
+        elif isinstance(value, Iterator):
+            self.iterator(value, level)
+        else:
+            self.value(json_default(value), level)
+        if len(self.parts) >= CHUNK_PARTS:
+            self.flush()
+
+    def rounded(self, values, types):
+        if self.decimals is None or float not in types:
+            return values
+        if types == {float}:
+            return round_values(values, self.decimals)
+        return [round(value, self.decimals) for value in values]
+
+    def numbers(self, values, separator):
+        """Return the list of numbers values as json text, or None if it
+        holds other types or non-finite floats."""
+        types = set(map(type, values))
+        if not types <= _NUMBER_TYPES:
+            return None
+        text = separator.join(map(repr, self.rounded(values, types)))
+        if float in types and "n" in text:
+            # nan or inf
+            return None
+        return text
+
+    def nested_numbers(self, values, level):
+        """Return nested lists of numbers, e.g. the cost blocks of a time
+        series, as json text, or None if they hold other types or non-finite
+        floats. All numbers are rounded and formatted together."""
+        flat = []
+        if not _flatten(values, flat):
+            return None
+        types = set(map(type, flat))
+        texts = list(map(repr, self.rounded(flat, types)))
+        if float in types and "n" in "".join(texts):
+            return None
+        return self.nested_text(values, level, iter(texts))
+
+    def nested_text(self, values, level, texts):
+        if not values:
+            return "[]"
+        inner = self.newline(level + 1)
+        items = [self.nested_text(value, level + 1, texts) if type(value) is list or type(value) is tuple
+                 else next(texts) for value in values]
+        return "[" + inner + ("," + inner).join(items) + self.newline(level) + "]"
+
+    def array(self, values, level):
+        if not values:
+            self.parts.append("[]")
+            return
+        inner = self.newline(level + 1)
+        separator = "," + inner
+        if type(values[0]) is list or type(values[0]) is tuple:
+            text = self.nested_numbers(values, level)
+        else:
+            text = self.numbers(values, separator)
+            if text is not None:
+                text = "[" + inner + text + self.newline(level) + "]"
+        if text is not None:
+            self.parts.append(text)
+            return
+        self.parts.append("[" + inner)
+        for i, value in enumerate(values):
+            if i:
+                self.parts.append(separator)
+            self.value(value, level + 1)
+        self.parts.append(self.newline(level) + "]")
+
+    def iterator(self, items, level):
+        first = next(items, _END)
+        if first is _END:
+            self.parts.append("[]")
+            return
+        inner = self.newline(level + 1)
+        separator = "," + inner
+        self.parts.append("[" + inner)
+        self.value(first, level + 1)
+        for value in items:
+            self.parts.append(separator)
+            self.value(value, level + 1)
+        self.parts.append(self.newline(level) + "]")
+
+    def object(self, items, level):
+        if not items:
+            self.parts.append("{}")
+            return
+        inner = self.newline(level + 1)
+        self.parts.append("{" + inner)
+        for i, (key, value) in enumerate(items):
+            if not isinstance(key, str):
+                key = json.dumps(key)
+            self.parts.append(("," + inner if i else "") + encode_basestring_ascii(key) + self.key_separator)
+            self.value(value, level + 1)
+        self.parts.append(self.newline(level) + "}")
@@ -19,5 +19,8 @@ setup(
     include_package_data=True,
     install_requires=[
         "pydantic"
-    ]
+    ],
+    extras_require={
+        "fast": ["orjson", "numpy"]
+    }
 )